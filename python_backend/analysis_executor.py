@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class AnalysisQueueFull(RuntimeError):
+    """Raised when the analysis executor is saturated and its wait queue is full."""
+
+
+class AnalysisExecutor:
+    """Runs CPU-bound mood analysis (text scoring, OpenCV face analysis) off the event loop.
+
+    Jobs go to a thread pool (default; OpenCV releases the GIL while running
+    cascades) or a process pool. Admission is bounded in two places:
+
+    - ``max_in_flight``: jobs handed to the pool at once. Further callers wait
+      without holding a worker, so the event loop keeps serving other routes.
+    - ``max_queue``: callers allowed to wait for a slot. Once that many are
+      waiting, ``run`` fails fast with ``AnalysisQueueFull`` instead of letting
+      latency grow without bound.
+
+    A slot is only released once the pool has actually finished the job, so a
+    cancelled caller never lets more than ``max_in_flight`` jobs run.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        initializer: Optional[Callable[[], Any]] = None,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown analysis executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_in_flight = max_in_flight or self.max_workers
+        self.max_queue = self.max_in_flight * 4 if max_queue is None else max_queue
+        self.initializer = initializer
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> Executor:
+        # Created lazily so importing the app (or uvicorn's reloader) never forks workers
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="analysis",
+                    initializer=self.initializer,
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            # asyncio primitives belong to one loop; tests may run several in turn
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._slots_loop = loop
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise AnalysisQueueFull("Analysis queue is full; try again shortly.")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        slots = self._slots
+
+        def _release(_future) -> None:
+            loop.call_soon_threadsafe(self._finish, slots)
+
+        self._in_flight += 1
+        try:
+            future = self._get_pool().submit(partial(fn, *args))
+        except Exception:
+            self._finish(slots)
+            raise
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+
+    async def warmup(self) -> None:
+        """Start every worker now so its initializer runs before the first request."""
+        pool = self._get_pool()
+        if self.kind == "thread":
+            # Each job parks on a barrier so every job lands on a distinct thread
+            job = partial(_wait_for_peers, threading.Barrier(self.max_workers))
+        else:
+            job = _noop
+        await asyncio.gather(
+            *(asyncio.wrap_future(pool.submit(job)) for _ in range(self.max_workers))
+        )
+
+    def _finish(self, slots: asyncio.Semaphore) -> None:
+        self._in_flight -= 1
+        self.completed += 1
+        slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "maxWorkers": self.max_workers,
+            "maxInFlight": self.max_in_flight,
+            "maxQueue": self.max_queue,
+            "inFlight": self._in_flight,
+            "queued": self._waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _wait_for_peers(barrier: threading.Barrier) -> None:
+    try:
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+
+
+def _noop() -> None:
+    return None
+
+
+def get_analysis_executor(initializer: Optional[Callable[[], Any]] = None) -> AnalysisExecutor:
+    """Build the executor from ``ANALYSIS_*`` environment variables."""
+
+    def _int_env(name: str) -> Optional[int]:
+        value = os.getenv(name)
+        return int(value) if value else None
+
+    return AnalysisExecutor(
+        kind=os.getenv("ANALYSIS_EXECUTOR", "thread").lower(),
+        max_workers=_int_env("ANALYSIS_WORKERS"),
+        max_in_flight=_int_env("ANALYSIS_MAX_IN_FLIGHT"),
+        max_queue=_int_env("ANALYSIS_MAX_QUEUE"),
+        initializer=initializer,
+    )
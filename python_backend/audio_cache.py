@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+AUDIO_EXTENSIONS = {
+    "audio/mpeg": ".mp3",
+    "audio/mp3": ".mp3",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/ogg": ".ogg",
+    "audio/webm": ".webm",
+}
+AUDIO_MEDIA_TYPES = {".mp3": "audio/mpeg", ".wav": "audio/wav", ".ogg": "audio/ogg", ".webm": "audio/webm"}
+
+# Stored file names: 64 hex chars of the key plus a known extension
+AUDIO_FILE_RE = re.compile(r"^[0-9a-f]{64}\.(mp3|wav|ogg|webm)$")
+
+
+class AudioCache:
+    """Content-addressed store of synthesized speech on local disk.
+
+    Each clip lives in ``directory`` as ``<sha256(text, language, voice)><ext>``,
+    so the file for a given request never changes and can be served with an
+    immutable cache header. An in-memory index keeps the files in LRU order
+    (seeded from modification times on startup); looking a clip up, storing it
+    and serving it (``touch``) all count as a use. Once the total size exceeds
+    ``max_bytes`` the least recently used clips are deleted, except those used
+    within the last ``grace`` seconds: their URLs were just handed out, so the
+    cache may briefly run over its size instead of breaking them.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, grace: float = 60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.grace = grace
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> (file name, size, last used as a wall-clock time)
+        self._files: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _scan(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not AUDIO_FILE_RE.match(name):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for mtime, name, size in sorted(entries):
+            self._files[name[:64]] = (name, size, mtime)
+            self.total_bytes += size
+
+    @staticmethod
+    def key(text: str, language: str, voice: Optional[str] = None) -> str:
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        payload = json.dumps([normalized, language.lower(), voice or ""], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _use(self, key: str, entry: Tuple[str, int, float]) -> None:
+        self._files[key] = (entry[0], entry[1], time.time())
+        self._files.move_to_end(key)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored file name for ``key`` (marking it recently used), or ``None``."""
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._use(key, entry)
+            self.hits += 1
+            return entry[0]
+
+    def touch(self, filename: str) -> bool:
+        """Mark a clip that is being served as recently used; ``False`` if it isn't indexed."""
+        key = filename[:64]
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None or entry[0] != filename:
+                return False
+            self._use(key, entry)
+            return True
+
+    def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        """Store ``data`` for ``key`` and return its file name.
+
+        Raises ``ValueError`` if ``data`` alone is larger than ``max_bytes``.
+        """
+        if len(data) > self.max_bytes:
+            raise ValueError(f"clip of {len(data)} bytes exceeds the cache size ({self.max_bytes} bytes)")
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        filename = key + AUDIO_EXTENSIONS.get(media_type, ".mp3")
+        temp_path = self.path(f".{filename}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, self.path(filename))
+
+        with self._lock:
+            now = time.time()
+            previous = self._files.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._files[key] = (filename, len(data), now)
+            self.total_bytes += len(data)
+            evicted = [previous[0]] if previous is not None and previous[0] != filename else []
+            while self.total_bytes > self.max_bytes:
+                old_key, (old_name, old_size, used_at) = next(iter(self._files.items()))
+                # LRU order: once the oldest entry is within the grace period, all the rest are too
+                if old_key == key or now - used_at < self.grace:
+                    break
+                del self._files[old_key]
+                self.total_bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.remove(self.path(old_name))
+            except FileNotFoundError:
+                pass
+        return filename
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(self._files),
+                "bytes": self.total_bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def get_audio_cache() -> AudioCache:
+    """Build the TTS audio cache from ``TTS_CACHE_*`` environment variables."""
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+    return AudioCache(
+        os.getenv("TTS_CACHE_DIR", default_dir),
+        max_bytes=int(float(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024),
+        grace=float(os.getenv("TTS_CACHE_GRACE_SECONDS", "60")),
+    )
@@ -0,0 +1,65 @@
+"""Build ``messages.json``: Lingo translations of the backend's fixed English strings.
+
+Run offline whenever a template changes (needs ``LINGO_API_KEY``)::
+
+    python build_message_catalog.py [--languages hi es zh ar] [--refresh]
+
+Existing translations are kept unless ``--refresh`` is given, so hand-edited
+entries survive a rebuild. Placeholders such as ``{mood}`` must come back
+intact; translations that lose them are skipped and reported.
+"""
+import argparse
+import json
+import os
+import sys
+
+from lingo_client import MockLingoClient, get_lingo_client
+from message_catalog import DEFAULT_CATALOG_PATH, MessageCatalog, _placeholders
+from message_templates import catalog_sources
+
+DEFAULT_LANGUAGES = ["hi", "es", "zh", "ar"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--languages", nargs="+", default=DEFAULT_LANGUAGES)
+    parser.add_argument("--output", default=os.getenv("MESSAGE_CATALOG_PATH", DEFAULT_CATALOG_PATH))
+    parser.add_argument("--refresh", action="store_true", help="re-translate existing entries")
+    args = parser.parse_args()
+
+    client = get_lingo_client()
+    if isinstance(client.client, MockLingoClient):
+        print("LINGO_API_KEY is required to build the catalog.", file=sys.stderr)
+        return 1
+
+    existing = MessageCatalog.load(args.output).messages
+    messages = {}
+    failures = 0
+    for source in catalog_sources():
+        translations = {} if args.refresh else dict(existing.get(source, {}))
+        for language in args.languages:
+            if language in translations:
+                continue
+            try:
+                result = client.translate(source, "en", language, cache=False)
+            except Exception as exc:
+                print(f"[{language}] {source!r}: {exc}", file=sys.stderr)
+                failures += 1
+                continue
+            text = (result.get("text") or "").strip()
+            if not text or _placeholders(text) != _placeholders(source):
+                print(f"[{language}] {source!r}: placeholders lost in {text!r}", file=sys.stderr)
+                failures += 1
+                continue
+            translations[language] = text
+        messages[source] = translations
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump({"languages": args.languages, "messages": messages}, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+    print(f"Wrote {len(messages)} messages to {args.output} ({failures} failed)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
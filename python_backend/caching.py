@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_PROMPT_NOISE_RE = re.compile(r"[^\w\s]")
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with an optional per-entry TTL.
+
+    Expired entries are dropped lazily when looked up (and count as misses);
+    the least recently used entry is evicted once ``max_size`` is exceeded.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None and ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, self._MISSING)
+            return default if entry is self._MISSING else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RotatingResponseCache:
+    """Caches several generated responses per prompt and hands them out in turn.
+
+    Keys are prompts normalized with ``key`` (case, punctuation and spacing
+    ignored). A key only answers from cache once it holds ``variants``
+    distinct responses; until then lookups miss so fresh responses fill the
+    pool. The TTL runs from a pool's first response, after which it is
+    rebuilt from new responses, and ``max_size`` bounds the number of pools.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: Optional[float] = None, variants: int = 3):
+        self.variants = max(1, variants)
+        self._pools = LRUCache(max_size=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        text = unicodedata.normalize("NFKC", prompt).casefold()
+        return " ".join(_PROMPT_NOISE_RE.sub(" ", text).split())
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the next cached response for ``key``, or ``None`` while its pool is filling."""
+        pool: Optional[List[Any]] = self._pools.get(key)
+        with self._lock:
+            if pool is None or len(pool[0]) < self.variants:
+                self.misses += 1
+                return None
+            responses, turn = pool
+            pool[1] = (turn + 1) % len(responses)
+            self.hits += 1
+            return responses[turn]
+
+    def add(self, key: str, response: str) -> None:
+        pool: Optional[List[Any]] = self._pools.get(key)
+        with self._lock:
+            if pool is not None:
+                if len(pool[0]) < self.variants and response not in pool[0]:
+                    pool[0].append(response)
+                return
+        # [responses, index of the next one to serve]
+        self._pools.set(key, [[response], 0])
+
+    def stats(self) -> Dict[str, Any]:
+        pools = self._pools.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": pools["size"],
+                "maxSize": pools["maxSize"],
+                "ttlSeconds": pools["ttlSeconds"],
+                "variants": self.variants,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": pools["evictions"],
+                "expirations": pools["expirations"],
+            }
+
+
+class SQLiteCache:
+    """Persistent JSON key/value cache with per-entry expiry, backed by one SQLite file.
+
+    Survives restarts; expiry uses wall-clock time. A single connection is
+    shared across threads behind a lock (writes are tiny and infrequent).
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.misses += 1
+                return default
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None and ttl > 0 else None
+        payload = json.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {"path": self.path, "size": size, "hits": self.hits, "misses": self.misses}
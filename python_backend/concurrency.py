@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent identical async calls onto one in-flight call.
+
+    The first caller for a key starts the call as its own task; callers that
+    arrive while it is running await the same task instead of starting another.
+    The task is shielded, so one caller being cancelled doesn't cancel the call
+    for everybody else. Once it finishes the key is released and the next call
+    starts fresh (results are not cached here).
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome retrieved even if every caller was cancelled meanwhile
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "upstreamCalls": self.calls,
+            "coalesced": self.coalesced,
+            "inFlight": len(self._inflight),
+        }
+
+
+class MicroBatcher:
+    """Collects submitted items for a short window and hands them to ``handler`` together.
+
+    A batch is dispatched when the window (measured from the first pending
+    item) elapses or ``max_batch`` items are waiting, whichever comes first.
+    While no batch is in flight, a lone item is dispatched at once: the window
+    only applies under load, when there is something to batch with.
+    ``handler`` receives the list of items and returns one result per item; a
+    result that is an exception is raised to that item's caller only.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        window: float = 0.003,
+        max_batch: int = 32,
+        name: str = "batcher",
+    ):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self._pending: List[Tuple[Any, "asyncio.Future[Any]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch or (len(self._pending) == 1 and not self._running):
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, "asyncio.Future[Any]"]]) -> None:
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as exc:
+            results = [exc] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller gave up meanwhile
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "averageBatchSize": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largestBatch": self.largest_batch,
+            "pending": len(self._pending),
+            "windowMs": self.window * 1000,
+        }
@@ -0,0 +1,92 @@
+import threading
+import weakref
+from typing import Any, Dict, NamedTuple, Optional
+
+import cv2
+
+
+class CascadeBundle(NamedTuple):
+    face: "cv2.CascadeClassifier"
+    eye: "cv2.CascadeClassifier"
+    smile: "cv2.CascadeClassifier"
+
+
+class _BundleHolder:
+    def __init__(self, bundle: CascadeBundle):
+        self.bundle = bundle
+
+
+class CascadeDetectorPool:
+    """Haar cascades parsed once per thread and reused for every frame.
+
+    ``cv2.CascadeClassifier`` instances are not safe to share between threads,
+    so each worker thread lazily gets its own face/eye/smile bundle and keeps it
+    for its lifetime. When a thread exits its bundle is released and the
+    held-count drops accordingly.
+    """
+
+    FILES = {
+        "face": "haarcascade_frontalface_default.xml",
+        "eye": "haarcascade_eye.xml",
+        "smile": "haarcascade_smile.xml",
+    }
+
+    def __init__(self, cascade_dir: Optional[str] = None):
+        self.cascade_dir = cascade_dir or cv2.data.haarcascades
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.bundles = 0
+        self.loads = 0
+        self.reuses = 0
+
+    def _load(self) -> CascadeBundle:
+        classifiers = {}
+        for name, filename in self.FILES.items():
+            classifier = cv2.CascadeClassifier(self.cascade_dir + filename)
+            if classifier.empty():
+                raise RuntimeError(f"Failed to load Haar cascade {filename}")
+            classifiers[name] = classifier
+        return CascadeBundle(**classifiers)
+
+    def _released(self) -> None:
+        with self._lock:
+            self.bundles -= 1
+
+    def get(self) -> CascadeBundle:
+        """Return the calling thread's cascades, loading them on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is not None:
+            with self._lock:
+                self.reuses += 1
+            return holder.bundle
+
+        holder = _BundleHolder(self._load())
+        weakref.finalize(holder, self._released)
+        self._local.holder = holder
+        with self._lock:
+            self.bundles += 1
+            self.loads += 1
+        return holder.bundle
+
+    def warmup(self) -> None:
+        """Load the calling thread's cascades ahead of its first request."""
+        if getattr(self._local, "holder", None) is None:
+            self.get()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "bundles": self.bundles,
+                "detectors": self.bundles * len(self.FILES),
+                "loads": self.loads,
+                "reuses": self.reuses,
+            }
+
+
+# Shared per-process pool; worker threads (or processes) each hold their own bundle
+cascade_pool = CascadeDetectorPool()
+
+
+def warmup_cascades() -> None:
+    """Executor initializer (module-level so process pools can pickle it)."""
+    cascade_pool.warmup()
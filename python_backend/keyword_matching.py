@@ -0,0 +1,299 @@
+import difflib
+import re
+import string
+import unicodedata
+from collections import Counter, deque
+from functools import lru_cache
+from math import comb
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher that finds every lexicon keyword in one pass over a text.
+
+    Keywords are compiled once into a trie with failure links, so matching cost
+    depends on the text length (plus the number of hits) rather than on the size
+    of the lexicon. Matching is plain substring matching, the same as
+    ``keyword in text``.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for index, keyword in enumerate(self.keywords):
+            self._add(keyword, index)
+        self._link()
+
+    def _add(self, keyword: str, index: int) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the failure state (suffix keywords)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring anywhere in ``text``."""
+        found: Set[int] = set()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+            if len(found) == len(self.keywords):
+                break
+        return {self.keywords[index] for index in found}
+
+
+# Letters plus the combining marks of the scripts we serve (Latin accents,
+# Devanagari vowel signs, Arabic harakat), so a word is never split mid-letter
+_WORD_CHARS = r"[\w\u0300-\u036f\u0900-\u0903\u093a-\u094f\u0951-\u0957\u0962\u0963\u064b-\u065f\u0670]"
+_WORD_RE = re.compile(rf"{_WORD_CHARS}+(?:'{_WORD_CHARS}+)*")
+# Scripts written without spaces between words: terms in them match as substrings
+_ASCII_SEPARATORS = str.maketrans({char: " " for char in string.punctuation if char not in "'_"})
+_UNSPACED_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+# Inflectional / derivational endings accepted after a (Latin-script) lexicon
+# word, e.g. "hopeless" also matches "hopelessness", "die" matches "dies"
+INFLECTION_SUFFIXES = ("s", "es", "d", "ed", "ing", "ness", "ly")
+
+
+def _inflections(word: str, suffixes: Tuple[str, ...]) -> Set[str]:
+    """Forms of ``word`` with one of ``suffixes`` added (plus the usual e-drop and ie -> y spellings)."""
+    if not suffixes or not word.isascii() or not word.isalpha():
+        return set()
+    forms = {word + suffix for suffix in suffixes}
+    if word.endswith("e"):
+        forms.update(word[:-1] + suffix for suffix in suffixes if suffix[0] in "ei")
+    if word.endswith("ie") and "ing" in suffixes:
+        forms.add(word[:-2] + "ying")
+    forms.discard(word)
+    return forms
+
+
+def _fold_table() -> Dict[int, str]:
+    table = {ord("’"): "'", ord("‘"): "'", ord("أ"): "ا", ord("إ"): "ا", ord("آ"): "ا", ord("ى"): "ي"}
+    for code in range(0xC0, 0x250):
+        base = unicodedata.normalize("NFD", chr(code))[0]
+        if base != chr(code) and base.isascii():
+            table[code] = base
+    return table
+
+
+_FOLD_TABLE = _fold_table()
+
+
+def _fold_text(text: str) -> str:
+    """Lower-case ``text``, strip accents from Latin letters and unify apostrophes / Arabic alef and yeh."""
+    return text.translate(_FOLD_TABLE).lower()
+
+
+class LexiconScanner:
+    """Whole-word matching of a multi-language lexicon over several texts in one call.
+
+    Terms are matched as sequences of whole words, so "die" no longer matches
+    "diet" and "self-harm" matches "self harm". Text and terms are folded the
+    same way first (lower case, Latin accents, apostrophe styles and Arabic
+    alef/yeh variants), so "no puedo mas" still finds "no puedo más". Each
+    text is split into words once and the words are looked up in a table of
+    term first words, so the cost depends on the text length rather than the
+    lexicon size. Terms in scripts written without spaces (Chinese, Japanese)
+    are matched as substrings, and only in texts that contain such characters.
+
+    With ``suffixes`` (e.g. ``INFLECTION_SUFFIXES``), each Latin-script word of
+    a term also matches its inflected forms, so "hopeless" finds
+    "hopelessness" and "give up" finds "giving up" while "die" still doesn't
+    match "diet". The forms are generated once from the lexicon, so scanning
+    remains one table lookup per word.
+    """
+
+    def __init__(self, terms: Iterable[str], suffixes: Tuple[str, ...] = ()):
+        self.terms: List[str] = []
+        self._by_first_word: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        self._unspaced: List[Tuple[str, int]] = []
+        # Inflected form -> the lexicon words it can stand for
+        self._bases: Dict[str, Tuple[str, ...]] = {}
+        seen: Set[Tuple[str, ...]] = set()
+        for term in terms:
+            folded = _fold_text(term)
+            if _UNSPACED_RE.search(folded):
+                key: Tuple[str, ...] = (folded,)
+            else:
+                key = tuple(_WORD_RE.findall(folded))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            index = len(self.terms)
+            self.terms.append(term)
+            if _UNSPACED_RE.search(folded):
+                self._unspaced.append((folded, index))
+            else:
+                self._by_first_word.setdefault(key[0], []).append((key, index))
+        bases: Dict[str, Set[str]] = {}
+        for key, _ in (entry for entries in self._by_first_word.values() for entry in entries):
+            for word in key:
+                for form in _inflections(word, suffixes):
+                    bases.setdefault(form, set()).add(word)
+        self._bases = {form: tuple(words) for form, words in bases.items()}
+        # Every text word that can start a term, for a quick "no match at all" check
+        self._first_words = set(self._by_first_word)
+        self._first_words.update(form for form, words in self._bases.items() if self._first_words.intersection(words))
+
+    def _word_is(self, word: str, lexicon_word: str) -> bool:
+        return word == lexicon_word or lexicon_word in self._bases.get(word, ())
+
+    def _matches_at(self, words: List[str], position: int, key: Tuple[str, ...]) -> bool:
+        if position + len(key) > len(words):
+            return False
+        return all(self._word_is(words[position + offset], key[offset]) for offset in range(1, len(key)))
+
+    def _scan_one(self, text: str) -> Set[int]:
+        folded = _fold_text(text)
+        hits: Set[int] = set()
+        by_first_word = self._by_first_word
+        if folded.isascii():
+            # Same words as _WORD_RE, but str.split is several times faster
+            words = [word.strip("'") for word in folded.translate(_ASCII_SEPARATORS).split()]
+        else:
+            words = _WORD_RE.findall(folded)
+        if not self._first_words.isdisjoint(words):
+            bases = self._bases
+            for position, word in enumerate(words):
+                for base in (word, *bases.get(word, ())):
+                    candidates = by_first_word.get(base)
+                    if candidates:
+                        for key, index in candidates:
+                            if len(key) == 1 or self._matches_at(words, position, key):
+                                hits.add(index)
+        if self._unspaced and _UNSPACED_RE.search(folded):
+            hits.update(index for term, index in self._unspaced if term in folded)
+        return hits
+
+    def scan(self, *texts: Optional[str]) -> List[str]:
+        """Return the terms found in any of ``texts``, without duplicates.
+
+        Hits are ordered text by text, and in lexicon order within a text.
+        Empty and repeated texts are skipped.
+        """
+        found: List[int] = []
+        seen: Set[int] = set()
+        for text in dict.fromkeys(t for t in texts if t):
+            for index in sorted(self._scan_one(text) - seen):
+                seen.add(index)
+                found.append(index)
+        return [self.terms[index] for index in found]
+
+
+class FuzzyKeywordIndex:
+    """Typo-tolerant lookup of lexicon keywords close to a single word.
+
+    Equivalent to comparing the word against every keyword with
+    ``difflib.SequenceMatcher(None, word, keyword).ratio() >= threshold``, but
+    only the keywords that can possibly reach the threshold are compared.
+
+    Candidates come from a SymSpell-style deletion dictionary: a ratio of at
+    least ``threshold`` needs ``ceil(threshold * (len(a) + len(b)) / 2)``
+    matching characters, so both strings reduce to a common subsequence of that
+    length by a bounded number of deletions. Every deletion variant of every
+    keyword within that bound is precomputed; a word only generates its own
+    variants and looks them up. For very long words, where the variant count
+    would exceed the number of length-compatible keywords, the index scans that
+    length bucket instead (filtered by a character-count upper bound).
+    """
+
+    def __init__(self, keywords: Iterable[str], threshold: float = 0.8, cache_size: int = 4096):
+        self.threshold = threshold
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self._by_length: Dict[int, List[str]] = {}
+        for keyword in self.keywords:
+            self._by_length.setdefault(len(keyword), []).append(keyword)
+        self._char_counts = {keyword: Counter(keyword) for keyword in self.keywords}
+        self._deletes: Dict[str, Set[str]] = {}
+        for keyword in self.keywords:
+            max_deletes = max(
+                (len(keyword) - self._min_matches(w, len(keyword))
+                 for w in range(1, 4 * len(keyword) + 1)
+                 if self._feasible(w, len(keyword))),
+                default=0,
+            )
+            for variant in _deletion_variants(keyword, max_deletes):
+                self._deletes.setdefault(variant, set()).add(keyword)
+        self.matches = lru_cache(maxsize=cache_size)(self._matches)
+
+    def _min_matches(self, len_a: int, len_b: int) -> int:
+        """Smallest matching-character count whose difflib ratio reaches the threshold."""
+        total = len_a + len_b
+        matches = max(0, int(self.threshold * total / 2) - 1)
+        while 2.0 * matches / total < self.threshold:
+            matches += 1
+        return matches
+
+    def _feasible(self, len_a: int, len_b: int) -> bool:
+        return self._min_matches(len_a, len_b) <= min(len_a, len_b)
+
+    def _matches(self, word: str) -> Dict[str, float]:
+        """Return ``{keyword: ratio}`` for every keyword within the threshold of ``word``."""
+        if not word:
+            return {}
+        lengths = [k for k in self._by_length if self._feasible(len(word), k)]
+        if not lengths:
+            return {}
+
+        max_deletes = max(len(word) - self._min_matches(len(word), k) for k in lengths)
+        bucket_size = sum(len(self._by_length[k]) for k in lengths)
+        variant_count = sum(comb(len(word), d) for d in range(max_deletes + 1))
+
+        candidates: Set[str] = set()
+        if variant_count <= bucket_size:
+            for variant in _deletion_variants(word, max_deletes):
+                candidates.update(self._deletes.get(variant, ()))
+        else:
+            word_counts = Counter(word)
+            for k in lengths:
+                needed = self._min_matches(len(word), k)
+                for keyword in self._by_length[k]:
+                    if sum((word_counts & self._char_counts[keyword]).values()) >= needed:
+                        candidates.add(keyword)
+
+        hits: Dict[str, float] = {}
+        for keyword in candidates:
+            ratio = difflib.SequenceMatcher(None, word, keyword).ratio()
+            if ratio >= self.threshold:
+                hits[keyword] = ratio
+        return hits
+
+
+def _deletion_variants(text: str, max_deletes: int) -> Set[str]:
+    """All strings obtainable from ``text`` by deleting up to ``max_deletes`` characters."""
+    variants = {text}
+    frontier = {text}
+    for _ in range(min(max_deletes, len(text))):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        variants |= frontier
+    return variants
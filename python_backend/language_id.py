@@ -0,0 +1,221 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+# Letters of these scripts identify the language on their own (for the languages we serve)
+SCRIPT_RANGES = {
+    "hi": ((0x0900, 0x097F), (0xA8E0, 0xA8FF)),  # Devanagari
+    "zh": ((0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0xF900, 0xFAFF)),  # Han
+    "ar": ((0x0600, 0x06FF), (0x0750, 0x077F), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)),  # Arabic
+}
+
+# Scripts (or letters) that mean "some other language" -> leave it to Lingo
+AMBIGUOUS_RANGES = (
+    (0x3040, 0x30FF),  # Hiragana / Katakana: Japanese written with kanji
+    (0xAC00, 0xD7AF),  # Hangul
+)
+# Arabic-script letters used by Urdu / Persian but not by Arabic
+NON_ARABIC_LETTERS = set("پچژگکیٹڈڑںےھہۂۓ")
+
+# Seed text for the Latin-script trigram profiles: everyday, wellbeing-flavoured
+# phrasing like the messages users actually send.
+LATIN_SEED_TEXT = {
+    "en": """
+        I feel so tired today and I don't know why. Work has been really stressful this week.
+        I'm anxious about my exams and I can't sleep at night. Thank you for listening to me.
+        My family keeps asking what is wrong but I don't want to talk about it. I am happy
+        that the weekend is here. Can you help me calm down? I think I need a break from
+        everything. Everyone around me seems busy and I feel lonely. It was a good day, I went
+        for a walk with my friend and we had coffee. I'm worried that I will lose my job.
+        Sometimes I just want to be alone. What should I do when I feel overwhelmed? I have
+        been feeling better since I started meditating in the morning. Nothing seems to work
+        and I'm frustrated. How are you doing? I need someone to talk to right now. My heart
+        is racing and my hands are shaking. The project deadline is tomorrow and I haven't
+        finished. I love spending time with my kids but they drain my energy. Please tell me
+        something positive. I am proud of myself for getting out of bed. Why does everything
+        feel so heavy? I would like to learn how to relax. We argued again last night and I
+        couldn't stop crying. I'm excited about the trip next month. It's hard to focus on
+        anything these days. I should probably drink more water and get some sleep.
+    """,
+    "es": """
+        Me siento muy cansado hoy y no sé por qué. El trabajo ha sido muy estresante esta
+        semana. Estoy ansiosa por mis exámenes y no puedo dormir por la noche. Gracias por
+        escucharme. Mi familia sigue preguntando qué pasa pero no quiero hablar de eso. Estoy
+        feliz de que llegó el fin de semana. ¿Puedes ayudarme a calmarme? Creo que necesito un
+        descanso de todo. Todos a mi alrededor parecen ocupados y me siento sola. Fue un buen
+        día, salí a caminar con mi amigo y tomamos un café. Tengo miedo de perder mi trabajo.
+        A veces solo quiero estar solo. ¿Qué debo hacer cuando me siento abrumado? Me he
+        sentido mejor desde que empecé a meditar por la mañana. Nada parece funcionar y estoy
+        frustrada. ¿Cómo estás? Necesito hablar con alguien ahora mismo. Mi corazón late muy
+        rápido y me tiemblan las manos. La fecha límite del proyecto es mañana y no he
+        terminado. Me encanta pasar tiempo con mis hijos pero me quitan la energía. Por favor
+        dime algo positivo. Estoy orgulloso de mí mismo por levantarme de la cama. ¿Por qué
+        todo se siente tan pesado? Me gustaría aprender a relajarme. Anoche discutimos otra vez
+        y no podía dejar de llorar. Estoy emocionada por el viaje del próximo mes. Es difícil
+        concentrarse en algo estos días. Debería tomar más agua y dormir un poco.
+    """,
+    # Neighbouring languages, so their text isn't confidently labelled en / es
+    "pt": """
+        Eu me sinto muito cansado hoje e não sei por quê. O trabalho tem sido muito estressante
+        esta semana. Estou ansiosa com as minhas provas e não consigo dormir à noite. Obrigado
+        por me ouvir. A minha família continua perguntando o que está errado, mas eu não quero
+        falar sobre isso. Estou feliz que o fim de semana chegou. Você pode me ajudar a ficar
+        calmo? Acho que preciso de uma pausa de tudo. Todo mundo ao meu redor parece ocupado e
+        eu me sinto sozinha. Foi um bom dia, saí para caminhar com meu amigo e tomamos um café.
+        Tenho medo de perder o meu emprego. Às vezes eu só quero ficar sozinho. O que devo fazer
+        quando me sinto sobrecarregado? Não consigo me concentrar em nada nesses dias.
+    """,
+    "fr": """
+        Je me sens très fatigué aujourd'hui et je ne sais pas pourquoi. Le travail a été
+        vraiment stressant cette semaine. Je suis anxieuse à cause de mes examens et je
+        n'arrive pas à dormir la nuit. Merci de m'écouter. Ma famille me demande ce qui ne va
+        pas mais je ne veux pas en parler. Je suis content que le week-end soit arrivé. Est-ce
+        que tu peux m'aider à me calmer? Je pense que j'ai besoin d'une pause. Tout le monde
+        autour de moi semble occupé et je me sens seule. C'était une bonne journée, je suis allé
+        me promener avec mon ami et nous avons pris un café. J'ai peur de perdre mon travail.
+        Qu'est-ce que je dois faire quand je me sens dépassé? C'est difficile de me concentrer.
+    """,
+    "de": """
+        Ich fühle mich heute so müde und ich weiß nicht warum. Die Arbeit war diese Woche
+        wirklich stressig. Ich habe Angst vor meinen Prüfungen und kann nachts nicht schlafen.
+        Danke, dass du mir zuhörst. Meine Familie fragt immer, was los ist, aber ich will nicht
+        darüber reden. Ich bin froh, dass endlich Wochenende ist. Kannst du mir helfen, mich zu
+        beruhigen? Ich glaube, ich brauche eine Pause von allem. Alle um mich herum sind
+        beschäftigt und ich fühle mich einsam. Es war ein guter Tag, ich bin mit meinem Freund
+        spazieren gegangen und wir haben Kaffee getrunken. Ich mache mir Sorgen, dass ich meinen
+        Job verliere. Was soll ich tun, wenn ich überfordert bin? Es fällt mir schwer, mich zu
+        konzentrieren.
+    """,
+    "it": """
+        Oggi mi sento così stanco e non so perché. Il lavoro è stato davvero stressante questa
+        settimana. Sono ansiosa per gli esami e non riesco a dormire la notte. Grazie per avermi
+        ascoltato. La mia famiglia continua a chiedermi cosa c'è che non va ma non voglio
+        parlarne. Sono felice che sia arrivato il fine settimana. Puoi aiutarmi a calmarmi?
+        Penso di avere bisogno di una pausa da tutto. Tutti intorno a me sembrano occupati e mi
+        sento sola. È stata una bella giornata, sono uscito a camminare con il mio amico e
+        abbiamo preso un caffè. Ho paura di perdere il lavoro. Cosa dovrei fare quando mi sento
+        sopraffatto? In questi giorni è difficile concentrarsi.
+    """,
+}
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def _script_of(char: str) -> Optional[str]:
+    code = ord(char)
+    if code < 0x80:
+        return "latin" if char.isalpha() else None
+    for language, ranges in SCRIPT_RANGES.items():
+        if any(low <= code <= high for low, high in ranges):
+            return language
+    if any(low <= code <= high for low, high in AMBIGUOUS_RANGES):
+        return "other"
+    if char.isalpha():
+        # Latin (incl. accented letters) is resolved by the n-gram model; other
+        # alphabets (Cyrillic, Greek, Thai, ...) are not ours to guess
+        return "latin" if "LATIN" in unicodedata.name(char, "") else "other"
+    return None
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+class TrigramProfile:
+    """Add-one smoothed character trigram language model built from seed text."""
+
+    def __init__(self, text: str):
+        self.counts = Counter(_trigrams(text))
+        # One extra vocabulary slot for unseen trigrams
+        denominator = sum(self.counts.values()) + len(self.counts) + 1
+        self.unseen = math.log(1 / denominator)
+        self.log_probabilities = {
+            trigram: math.log((count + 1) / denominator) for trigram, count in self.counts.items()
+        }
+
+    def score(self, trigrams: Iterable[str]) -> float:
+        """Log-likelihood of a trigram sequence under this profile."""
+        log_probabilities = self.log_probabilities
+        unseen = self.unseen
+        return sum(log_probabilities.get(trigram, unseen) for trigram in trigrams)
+
+
+class LocalLanguageDetector:
+    """Offline language identification for the languages the app serves.
+
+    Two passes, both well under a millisecond:
+
+    - Script: Devanagari, Han and Arabic letters map straight to hi / zh / ar.
+      Confidence is the share of letters in that script, so mixed-script text
+      (e.g. Hinglish) or Urdu/Persian-only letters lower it.
+    - Latin: a character trigram model picks between the seed languages (en,
+      es, plus pt / fr / de / it so nearby languages aren't forced into en or
+      es). Confidence is the posterior of the winner, scaled down when too few
+      of the text's trigrams are known to the winning profile (i.e. it probably
+      is some other Latin-script language).
+
+    ``detect`` returns ``None`` when it has no opinion; callers compare the
+    confidence against their own threshold.
+    """
+
+    def __init__(
+        self,
+        seed_text: Optional[Dict[str, str]] = None,
+        min_trigrams: int = 8,
+        min_coverage: float = 0.6,
+    ):
+        self.profiles = {
+            language: TrigramProfile(text)
+            for language, text in (seed_text or LATIN_SEED_TEXT).items()
+        }
+        self.min_trigrams = min_trigrams
+        self.min_coverage = min_coverage
+
+    def detect(self, text: str) -> Optional[Tuple[str, float]]:
+        """Return ``(language, confidence)`` for ``text``, or ``None`` if unsure."""
+        scripts: Counter = Counter()
+        non_arabic = 0
+        for char in text:
+            script = _script_of(char)
+            if script is not None:
+                scripts[script] += 1
+                if char in NON_ARABIC_LETTERS:
+                    non_arabic += 1
+        letters = sum(scripts.values())
+        if not letters:
+            return None
+
+        script, count = scripts.most_common(1)[0]
+        if script == "other":
+            return None
+        if script != "latin":
+            if script == "ar" and non_arabic:
+                return None
+            return script, count / letters
+        return self._detect_latin(text, count / letters)
+
+    def _detect_latin(self, text: str, script_share: float) -> Optional[Tuple[str, float]]:
+        trigrams = list(_trigrams(text))
+        if not trigrams:
+            return None
+
+        scores = {language: profile.score(trigrams) for language, profile in self.profiles.items()}
+        best = max(scores, key=scores.get)
+        # Softmax over languages; subtract the max to stay in float range
+        posterior = 1.0 / sum(math.exp(score - scores[best]) for score in scores.values())
+
+        known = self.profiles[best].counts
+        coverage = sum(1 for t in trigrams if t in known) / len(trigrams)
+        confidence = posterior * script_share * min(1.0, coverage / self.min_coverage)
+        if len(trigrams) < self.min_trigrams:
+            # Too little text to tell reliably (e.g. "ok", "hola")
+            confidence *= len(trigrams) / self.min_trigrams
+        return best, confidence
+
+
+local_language_detector = LocalLanguageDetector()
@@ -1,9 +1,18 @@
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Any, Dict, Optional
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
 import requests
 
+from caching import LRUCache, SQLiteCache
+from concurrency import MicroBatcher, SingleFlight
+from language_id import LocalLanguageDetector, local_language_detector
+from resilience import CircuitBreaker, Hedger, breaker_from_env
+
 logger = logging.getLogger(__name__)
 
 LINGO_API_BASE = "https://api.lingo.dev/v1"
@@ -92,13 +101,567 @@ class MockLingoClient:
         return {"audioUrl": ""}
 
 
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncLingoClient:
+    """Async Lingo.dev client on a pooled ``httpx.AsyncClient``.
+
+    Connections are kept alive and reused across requests (HTTP/2 when the
+    ``h2`` package is installed), so concurrent calls are bounded by the pool
+    limits rather than by threads blocked on the network.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = LINGO_API_BASE,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        http2: Optional[bool] = None,
+    ):
+        self.api_key = api_key or os.getenv("LINGO_API_KEY")
+        if not self.api_key:
+            raise ValueError("Missing LINGO_API_KEY environment variable.")
+        self.base_url = base_url.rstrip("/")
+        self.http2 = _http2_available() if http2 is None else http2
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            http2=self.http2,
+        )
+
+    async def _request(
+        self,
+        endpoint: str,
+        *,
+        method: str = "POST",
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        response = await self.client.request(
+            method,
+            endpoint,
+            json=json,
+            data=data,
+            files=files,
+        )
+        if not response.is_success:
+            raise RuntimeError(
+                f"Lingo API error {response.status_code}: {response.text}"
+            )
+        return response.json()
+
+    async def detect_language(self, text: str) -> Dict[str, Any]:
+        return await self._request("/detect-language", json={"text": text})
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        return await self._request(
+            "/translate",
+            json={
+                "text": text,
+                "from": source_lang,
+                "to": target_lang,
+            },
+        )
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        files = {
+            "audio": ("input.wav", audio_bytes, "audio/wav"),
+        }
+        form_data = {"language": language}
+        return await self._request("/speech-to-text", files=files, data=form_data)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        payload = {"text": text, "language": language}
+        if voice:
+            payload["voice"] = voice
+        return await self._request("/text-to-speech", json=payload)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class AsyncMockLingoClient:
+    """Async counterpart of ``MockLingoClient``."""
+
+    async def detect_language(self, text: str) -> Dict[str, Any]:
+        return {"language": "en"}
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        return {"text": text, "detectedLanguage": source_lang}
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return {"text": "mock transcription", "detectedLanguage": "en"}
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {"audioUrl": ""}
+
+    async def aclose(self) -> None:
+        return None
+
+
+class CoalescingLingoClient:
+    """Async wrapper that shares one upstream call among identical concurrent requests.
+
+    Applies to ``detect_language``, ``translate`` and ``text_to_speech``, keyed
+    on the exact text and language/voice arguments. Every caller gets its own
+    copy of the result dict.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.flights = {
+            "detect": SingleFlight("detect"),
+            "translate": SingleFlight("translate"),
+            "tts": SingleFlight("tts"),
+        }
+
+    async def detect_language(self, text: str) -> Dict[str, Any]:
+        result = await self.flights["detect"].do(
+            text, lambda: self.client.detect_language(text)
+        )
+        return dict(result)
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        result = await self.flights["translate"].do(
+            (text, source_lang, target_lang),
+            lambda: self.client.translate(text, source_lang, target_lang),
+        )
+        return dict(result)
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return await self.client.speech_to_text(audio_bytes, language)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        result = await self.flights["tts"].do(
+            (text, language, voice),
+            lambda: self.client.text_to_speech(text, language, voice),
+        )
+        return dict(result)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {name: flight.stats() for name, flight in self.flights.items()}
+        if hasattr(self.client, "stats"):
+            stats["batching"] = self.client.stats()
+        return stats
+
+
+class ResilientLingoClient:
+    """Async wrapper adding a circuit breaker per Lingo operation, plus optional hedging.
+
+    ``detect_language``, ``translate`` and ``text_to_speech`` each get their
+    own breaker, so a degraded endpoint fails fast (``CircuitOpen``, which
+    callers already treat like any other Lingo error) without blocking the
+    healthy ones. The idempotent ``detect_language`` / ``translate`` calls are
+    hedged when a ``Hedger`` is given; a hedged pair counts as one call.
+    """
+
+    def __init__(self, client, breakers: Dict[str, CircuitBreaker], hedger: Optional[Hedger] = None):
+        self.client = client
+        self.breakers = breakers
+        self.hedger = hedger
+
+    async def _call(self, operation: str, fn, idempotent: bool) -> Dict[str, Any]:
+        breaker = self.breakers[operation]
+        if idempotent and self.hedger is not None:
+            return await breaker.call(self.hedger.run, fn)
+        return await breaker.call(fn)
+
+    async def detect_language(self, text: str) -> Dict[str, Any]:
+        return await self._call("detect", lambda: self.client.detect_language(text), idempotent=True)
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        return await self._call(
+            "translate",
+            lambda: self.client.translate(text, source_lang, target_lang),
+            idempotent=True,
+        )
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return await self.client.speech_to_text(audio_bytes, language)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self._call("tts", lambda: self.client.text_to_speech(text, language, voice), idempotent=False)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class BatchingLingoClient:
+    """Async wrapper that dispatches ``translate`` calls in micro-batches.
+
+    Calls arriving within ``window`` seconds of each other are collected and
+    sent together. Lingo exposes no bulk translate endpoint, so a batch fans out
+    as concurrent requests over the shared connection pool, with at most
+    ``max_concurrency`` outstanding across all batches (normally the size of
+    the connection pool). Under load the upstream sees a steady, bounded stream
+    instead of one burst per request; when idle, a lone call is sent at once.
+    """
+
+    def __init__(self, client, window: float = 0.003, max_batch: int = 32, max_concurrency: int = 100):
+        self.client = client
+        self.batcher = MicroBatcher(self._translate_batch, window=window, max_batch=max_batch, name="translate")
+        self._limit = asyncio.Semaphore(max_concurrency)
+
+    async def _translate_one(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        async with self._limit:
+            return await self.client.translate(text, source_lang, target_lang)
+
+    async def _translate_batch(self, items: List[Tuple[str, str, str]]) -> List[Any]:
+        return await asyncio.gather(
+            *(self._translate_one(*item) for item in items),
+            return_exceptions=True,
+        )
+
+    async def detect_language(self, text: str) -> Dict[str, Any]:
+        return await self.client.detect_language(text)
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        return await self.batcher.submit((text, source_lang, target_lang))
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return await self.client.speech_to_text(audio_bytes, language)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.client.text_to_speech(text, language, voice)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.batcher.stats()
+
+
+class TranslationCache:
+    """Two-tier cache for Lingo results: in-memory LRU in front of an optional SQLite file.
+
+    Keys hash the operation, the NFC/whitespace-normalized text and the
+    language pair, so the on-disk tier never stores the source text as a key.
+    Disk hits are promoted into memory. Entries read or written with
+    ``persist=False`` stay in memory only. The ``*_async`` variants run the
+    disk tier in a worker thread so SQLite never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache,
+        disk: Optional[SQLiteCache] = None,
+        translate_ttl: Optional[float] = None,
+        detect_ttl: Optional[float] = None,
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.ttls = {"translate": translate_ttl, "detect": detect_ttl}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def key(self, operation: str, text: str, *parts: Optional[str]) -> str:
+        raw = "\x1f".join([operation, self.normalize(text), *((p or "").lower() for p in parts)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _uses_disk(self, persist: bool) -> bool:
+        return persist and self.disk is not None
+
+    def get(self, key: str, persist: bool = True) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None and self._uses_disk(persist):
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    async def get_async(self, key: str, persist: bool = True) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None and self._uses_disk(persist):
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, operation: str, key: str, value: Dict[str, Any], persist: bool = True) -> None:
+        ttl = self.ttls.get(operation)
+        self.memory.set(key, value, ttl=ttl)
+        if self._uses_disk(persist):
+            self.disk.set(key, value, ttl=ttl)
+
+    async def set_async(self, operation: str, key: str, value: Dict[str, Any], persist: bool = True) -> None:
+        ttl = self.ttls.get(operation)
+        self.memory.set(key, value, ttl=ttl)
+        if self._uses_disk(persist):
+            await asyncio.to_thread(self.disk.set, key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+class CachedLingoClient:
+    """Wraps a Lingo client so repeated translate / detect_language calls skip the network.
+
+    Pass ``cache=False`` for text that must not be retained (e.g. user free text
+    when the user's privacy settings disallow it); such calls neither read nor
+    write the cache. ``persist=False`` keeps the result out of the on-disk tier.
+    """
+
+    def __init__(self, client, cache: TranslationCache):
+        self.client = client
+        self.cache = cache
+
+    def _cached(self, operation: str, call, persist: bool, text: str, *parts: str) -> Dict[str, Any]:
+        key = self.cache.key(operation, text, *parts)
+        cached = self.cache.get(key, persist)
+        if cached is not None:
+            return dict(cached)
+        result = call()
+        self.cache.set(operation, key, result, persist)
+        return result
+
+    def detect_language(self, text: str, cache: bool = True, persist: bool = True) -> Dict[str, Any]:
+        if not cache:
+            return self.client.detect_language(text)
+        return self._cached("detect", lambda: self.client.detect_language(text), persist, text)
+
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        cache: bool = True,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
+        if not cache:
+            return self.client.translate(text, source_lang, target_lang)
+        return self._cached(
+            "translate",
+            lambda: self.client.translate(text, source_lang, target_lang),
+            persist,
+            text,
+            source_lang,
+            target_lang,
+        )
+
+    def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return self.client.speech_to_text(audio_bytes, language)
+
+    def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return self.client.text_to_speech(text, language, voice)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+class AsyncCachedLingoClient(CachedLingoClient):
+    """Async counterpart of ``CachedLingoClient``; can share its ``TranslationCache``.
+
+    ``detect_language`` / ``translate`` reuse the parent's methods: with an
+    async inner client and an async ``_cached`` both return awaitables, so
+    keys, TTLs and the ``cache`` / ``persist`` flags are handled in one place.
+    """
+
+    async def _cached(self, operation: str, call, persist: bool, text: str, *parts: str) -> Dict[str, Any]:
+        key = self.cache.key(operation, text, *parts)
+        cached = await self.cache.get_async(key, persist)
+        if cached is not None:
+            return dict(cached)
+        result = await call()
+        await self.cache.set_async(operation, key, result, persist)
+        return result
+
+    async def detect_language(self, text: str, cache: bool = True, persist: bool = True) -> Dict[str, Any]:
+        return await super().detect_language(text, cache, persist)
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        cache: bool = True,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
+        return await super().translate(text, source_lang, target_lang, cache, persist)
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return await self.client.speech_to_text(audio_bytes, language)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.client.text_to_speech(text, language, voice)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"cache": self.cache.stats()}
+        if hasattr(self.client, "stats"):
+            stats["coalescing"] = self.client.stats()
+        return stats
+
+
+class LocalDetectingLingoClient:
+    """Async wrapper that answers ``detect_language`` locally when it can.
+
+    The offline detector runs first; only text it can't identify with at least
+    ``min_confidence`` goes on to Lingo (through the cache and the rest of the
+    chain). Everything else is passed through unchanged.
+    """
+
+    def __init__(self, client, detector: LocalLanguageDetector, min_confidence: float = 0.9):
+        self.client = client
+        self.detector = detector
+        self.min_confidence = min_confidence
+        self.local = 0
+        self.fallbacks = 0
+
+    async def detect_language(self, text: str, cache: bool = True, persist: bool = True) -> Dict[str, Any]:
+        guess = self.detector.detect(text)
+        if guess is not None and guess[1] >= self.min_confidence:
+            self.local += 1
+            return {"language": guess[0], "confidence": round(guess[1], 4), "source": "local"}
+        self.fallbacks += 1
+        return await self.client.detect_language(text, cache=cache, persist=persist)
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        cache: bool = True,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
+        return await self.client.translate(text, source_lang, target_lang, cache=cache, persist=persist)
+
+    async def speech_to_text(self, audio_bytes: bytes, language: str = "auto") -> Dict[str, Any]:
+        return await self.client.speech_to_text(audio_bytes, language)
+
+    async def text_to_speech(
+        self, text: str, language: str, voice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.client.text_to_speech(text, language, voice)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        detections = self.local + self.fallbacks
+        stats = {
+            "languageId": {
+                "local": self.local,
+                "fallbacks": self.fallbacks,
+                "localRate": round(self.local / detections, 4) if detections else 0.0,
+                "minConfidence": self.min_confidence,
+            }
+        }
+        stats.update(self.client.stats())
+        return stats
+
+
+def _optional_float_env(name: str, default: str) -> Optional[float]:
+    value = float(os.getenv(name, default))
+    return value if value > 0 else None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Build the translation cache from ``LINGO_CACHE_*`` environment variables."""
+    disk_path = os.getenv("LINGO_CACHE_DB")
+    return TranslationCache(
+        memory=LRUCache(max_size=int(os.getenv("LINGO_CACHE_SIZE", "2048"))),
+        disk=SQLiteCache(disk_path) if disk_path else None,
+        translate_ttl=_optional_float_env("LINGO_CACHE_TTL_SECONDS", str(7 * 24 * 3600)),
+        detect_ttl=_optional_float_env("LINGO_DETECT_CACHE_TTL_SECONDS", str(24 * 3600)),
+    )
+
+
 def get_lingo_client():
     try:
-        return LingoClient()
+        client = LingoClient()
     except ValueError:
         logger.warning(
             "LINGO_API_KEY not set; using mock Lingo client. "
             "Translations will be simulated."
         )
-        return MockLingoClient()
+        client = MockLingoClient()
+    return CachedLingoClient(client, get_translation_cache())
+
+
+def get_async_lingo_client(cache: Optional[TranslationCache] = None):
+    """Async client for the request path, configured from ``LINGO_HTTP_*`` variables.
 
+    Pass the sync client's cache to share cached translations between both.
+    """
+    http2_setting = os.getenv("LINGO_HTTP2", "auto").lower()
+    max_connections = int(os.getenv("LINGO_HTTP_MAX_CONNECTIONS", "100"))
+    try:
+        client = AsyncLingoClient(
+            max_connections=max_connections,
+            max_keepalive_connections=int(os.getenv("LINGO_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LINGO_HTTP_KEEPALIVE_SECONDS", "30")),
+            timeout=float(os.getenv("LINGO_HTTP_TIMEOUT_SECONDS", "30")),
+            connect_timeout=float(os.getenv("LINGO_HTTP_CONNECT_TIMEOUT_SECONDS", "5")),
+            http2=None if http2_setting == "auto" else http2_setting in ("1", "true", "yes"),
+        )
+    except ValueError:
+        client = AsyncMockLingoClient()
+    # cache -> coalesce -> micro-batch -> breaker/hedge -> network: only cache
+    # misses reach the single-flight layer, and only distinct in-flight
+    # translations get batched
+    hedge_delay_ms = float(os.getenv("LINGO_HEDGE_DELAY_MS", "0"))
+    client = ResilientLingoClient(
+        client,
+        {operation: breaker_from_env("LINGO", f"lingo.{operation}") for operation in ("detect", "translate", "tts")},
+        hedger=Hedger("lingo", hedge_delay_ms / 1000) if hedge_delay_ms > 0 else None,
+    )
+    batch_window_ms = float(os.getenv("LINGO_BATCH_WINDOW_MS", "3"))
+    if batch_window_ms > 0:
+        client = BatchingLingoClient(
+            client,
+            window=batch_window_ms / 1000,
+            max_batch=int(os.getenv("LINGO_BATCH_MAX_SIZE", "32")),
+            # Defaults to the pool size: batching shapes bursts, it shouldn't cap throughput
+            max_concurrency=int(os.getenv("LINGO_BATCH_MAX_CONCURRENCY", str(max_connections))),
+        )
+    client = AsyncCachedLingoClient(CoalescingLingoClient(client), cache or get_translation_cache())
+    if os.getenv("LANGUAGE_ID_LOCAL", "true").lower() in ("1", "true", "yes"):
+        # Offline language ID in front of everything; only unsure texts reach Lingo
+        client = LocalDetectingLingoClient(
+            client,
+            local_language_detector,
+            min_confidence=float(os.getenv("LANGUAGE_ID_MIN_CONFIDENCE", "0.9")),
+        )
+    return client
@@ -0,0 +1,231 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from pipeline import StageTimer
+from resilience import CircuitBreaker
+
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+# Lower value = served first
+PRIORITY_CRISIS = 0
+PRIORITY_ROUTINE = 1
+PRIORITY_NAMES = {PRIORITY_CRISIS: "crisis", PRIORITY_ROUTINE: "routine"}
+
+
+class LLMGateway:
+    """Chat completions for an OpenAI-compatible API through one shared gateway.
+
+    - One pooled ``httpx.AsyncClient``: connections are kept alive between
+      requests instead of a fresh TCP + TLS handshake per call.
+    - At most ``max_concurrency`` requests (streams included) are in flight;
+      the rest wait in a priority queue, so crisis messages are sent before
+      routine ones that queued earlier. Equal priorities are served FIFO.
+    - ``breaker`` (optional) guards the upstream call itself; time spent
+      queued never counts as a slow call.
+
+    ``base_url`` can point at any OpenAI-compatible server (e.g.
+    ``mock_llm_server.py`` for local testing); the API key is optional then.
+    Meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = OPENAI_API_BASE,
+        model: str = "gpt-4o-mini",
+        *,
+        max_concurrency: int = 8,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self.wait_timer = StageTimer()
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether there is an upstream to call (an API key, or a custom base URL)."""
+        return bool(self.api_key) or self.base_url != OPENAI_API_BASE
+
+    async def _acquire(self, priority: int) -> None:
+        started = time.perf_counter()
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed to us just as we were cancelled; pass it on
+                    self._release()
+                raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.wait_timer.record({PRIORITY_NAMES.get(priority, str(priority)): elapsed_ms})
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter, skipping cancelled ones
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def _slot(self, priority: int) -> AsyncIterator[None]:
+        await self._acquire(priority)
+        self.requests += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _body(self, messages: List[Dict[str, str]], stream: bool, params: Dict[str, Any]) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"model": self.model, "messages": messages, **params}
+        if stream:
+            body["stream"] = True
+        return body
+
+    async def _post_completion(self, body: Dict[str, Any]) -> str:
+        response = await self.client.post("/chat/completions", json=body)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("choices"):
+            return (data["choices"][0]["message"]["content"] or "").strip()
+        return ""
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        priority: int = PRIORITY_ROUTINE,
+        **params: Any,
+    ) -> str:
+        """Return the completion text for ``messages`` (``""`` if the API returned no choices)."""
+        body = self._body(messages, False, params)
+        async with self._slot(priority):
+            try:
+                if self.breaker is not None:
+                    return await self.breaker.call(self._post_completion, body)
+                return await self._post_completion(body)
+            except Exception:
+                self.failures += 1
+                raise
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        priority: int = PRIORITY_ROUTINE,
+        **params: Any,
+    ) -> AsyncIterator[str]:
+        """Yield the completion for ``messages`` piece by piece as it is generated.
+
+        The concurrency slot is held until the stream ends. The breaker's
+        slow-call threshold applies to the time to the first token.
+        """
+        body = self._body(messages, True, params)
+        async with self._slot(priority):
+            breaker = self.breaker
+            probe = breaker.admit() if breaker is not None else False
+            slow = False
+
+            def _mark_slow() -> None:
+                nonlocal slow
+                slow = True
+                breaker.record_failure()
+
+            timer = None
+            if breaker is not None and breaker.slow_call_seconds:
+                timer = asyncio.get_running_loop().call_later(breaker.slow_call_seconds, _mark_slow)
+            try:
+                async with self.client.stream("POST", "/chat/completions", json=body) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        choices = json.loads(data).get("choices") or [{}]
+                        content = (choices[0].get("delta") or {}).get("content")
+                        if content:
+                            if timer is not None:
+                                timer.cancel()
+                                timer = None
+                            yield content
+            except Exception:
+                self.failures += 1
+                if breaker is not None and not slow:
+                    breaker.record_failure()
+                raise
+            else:
+                if breaker is not None and not slow:
+                    breaker.record_success()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                if breaker is not None:
+                    breaker.release(probe)
+
+    def stats(self) -> Dict[str, Any]:
+        queued: Dict[str, int] = {}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                queued[name] = queued.get(name, 0) + 1
+        return {
+            "baseUrl": self.base_url,
+            "model": self.model,
+            "maxConcurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": sum(queued.values()),
+            "queuedByPriority": queued,
+            "requests": self.requests,
+            "failures": self.failures,
+            "waitMs": self.wait_timer.stats(),
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def get_llm_gateway(breaker: Optional[CircuitBreaker] = None) -> LLMGateway:
+    """Build the gateway from ``OPENAI_*`` environment variables."""
+    return LLMGateway(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL", OPENAI_API_BASE),
+        model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "8")),
+        keepalive_expiry=float(os.getenv("OPENAI_HTTP_KEEPALIVE_SECONDS", "30")),
+        timeout=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30")),
+        breaker=breaker,
+    )
@@ -1,18 +1,31 @@
 import asyncio
+import json
 import random
+import re
+import time
+from collections import deque
 from datetime import datetime, timedelta
-import requests
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 import os
-from typing import List, Optional
+import httpx
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
 
 from models import (
     MoodDetectionRequest,
     MoodDetectionResponse,
+    MoodBurstDetectionRequest,
+    FaceAnalysisResult,
+    MoodEntry,
+    MoodFusionResult,
+    TextSentimentResult,
+    MoodBatchDetectionRequest,
+    MoodBatchDetectionResponse,
+    MoodBatchResult,
+    MoodEntryCreate,
     ErrorResponse,
     Task,
     TaskCreate,
@@ -35,9 +48,36 @@ from models import (
     PeerChatMessage,
     PeerMatch,
 )
-from mood_analysis import analyze_text_sentiment, analyze_facial_expression, mock_face_analysis, fuse_mood_analysis
+from mood_analysis import (
+    analyze_text_sentiment,
+    analyze_text_sentiment_batch,
+    analyze_facial_expression,
+    analyze_facial_expression_bytes,
+    analyze_facial_burst,
+    mock_face_analysis,
+    fuse_mood_analysis,
+    FACE_REDETECT_EVERY,
+    FACE_RESULT_CACHE,
+)
 from storage import storage
-from lingo_client import get_lingo_client
+from lingo_client import get_async_lingo_client, get_lingo_client
+from analysis_executor import AnalysisQueueFull, get_analysis_executor
+from face_detectors import cascade_pool, warmup_cascades
+from message_catalog import get_message_catalog
+from message_templates import (
+    FALLBACK_EMPATHY_RESPONSES,
+    MOOD_MESSAGE_TEMPLATE,
+    PEER_MODERATED_REPLY,
+    PEER_MODERATION_NOTICE,
+    PEER_REPLY_TEMPLATES,
+)
+from audio_cache import AUDIO_FILE_RE, AUDIO_MEDIA_TYPES, get_audio_cache
+from concurrency import SingleFlight
+from pipeline import StageGraph, StageTimer
+from resilience import breaker_from_env, resilience_stats
+from caching import RotatingResponseCache
+from keyword_matching import INFLECTION_SUFFIXES, LexiconScanner
+from llm_gateway import PRIORITY_CRISIS, PRIORITY_ROUTINE, get_llm_gateway
 
 load_dotenv()
 
@@ -237,19 +277,46 @@ MEAL_RECOMMENDATIONS = {
 
 app = FastAPI(title="MoodLiftMeals API", version="1.0.0")
 lingo_client = get_lingo_client()
+# Request-path Lingo calls go through the pooled async client (shares the translation cache)
+async_lingo_client = get_async_lingo_client(lingo_client.cache)
+analysis_executor = get_analysis_executor(initializer=warmup_cascades)
+# Pre-translated fixed strings; templated responses skip Lingo when covered
+message_catalog = get_message_catalog()
+# Synthesized speech is downloaded once and served from local disk
+tts_audio_cache = get_audio_cache()
+tts_audio_flight = SingleFlight("tts-audio")
+audio_http_client = httpx.AsyncClient(timeout=30, follow_redirects=True)
+# Larger clips are not downloaded (or cached); clients get Lingo's URL instead
+TTS_MAX_DOWNLOAD_BYTES = min(
+    int(float(os.getenv("TTS_MAX_DOWNLOAD_MB", "10")) * 1024 * 1024),
+    tts_audio_cache.max_bytes,
+)
+TTS_AUDIO_ROUTE = "/api/mood/tts/audio"
+TTS_AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+mood_pipeline_timer = StageTimer()
+# Default end-to-end budget for mood detection; clients may send their own via the header
+MOOD_DETECT_BUDGET_MS = float(os.getenv("MOOD_DETECT_BUDGET_MS", "3000"))
+REQUEST_BUDGET_HEADER = "X-Request-Budget-Ms"
 DEFAULT_ANALYSIS_LANGUAGE = "en"
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Fail fast to the fallback responses while OpenAI is erroring or stalling
+openai_breaker = breaker_from_env("OPENAI", "openai.chat")
+# Pooled, concurrency-limited OpenAI client; crisis messages are queued first
+llm_gateway = get_llm_gateway(breaker=openai_breaker)
+# Generated empathy replies per normalized English prompt, rotated between repeats
+empathy_cache = RotatingResponseCache(
+    max_size=int(os.getenv("EMPATHY_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("EMPATHY_CACHE_TTL_SECONDS", "3600")),
+    variants=int(os.getenv("EMPATHY_CACHE_VARIANTS", "3")),
+)
+LINGO_CACHE_USER_TEXT = os.getenv("LINGO_CACHE_USER_TEXT", "true").lower() in ("1", "true", "yes")
 
 
-FALLBACK_EMPATHY_RESPONSES = [
-    "I hear you. That sounds heavy, and it makes sense you'd feel that way. Let’s take this one small step at a time together. 💜",
-    "Thank you for trusting me with that. Your feelings matter, and I’m here to help you breathe through them.",
-    "It’s okay to feel exactly how you do right now. You’re not alone, and we can find a gentle next step whenever you’re ready.",
-]
+# Sentence boundary in a streamed English reply: end punctuation (plus closing quotes) and whitespace
+SENTENCE_END_RE = re.compile(r"((?:(?<=[.!?…])|(?<=[.!?…][\"'”’)]))\s+)")
 
 CRISIS_KEYWORDS_EN = [
     "suicide",
+    "suicidal",
     "kill myself",
     "hurt myself",
     "self harm",
@@ -268,6 +335,81 @@ CRISIS_KEYWORDS_EN = [
     "give up",
 ]
 
+# Native-language crisis terms, matched on the original text so detection
+# doesn't depend on the Lingo translation arriving
+CRISIS_KEYWORDS_NATIVE = {
+    "hi": [
+        "आत्महत्या",
+        "खुदकुशी",
+        "ख़ुदकुशी",
+        "खुद को मार",
+        "अपने आप को मार",
+        "खुद को नुकसान",
+        "खुद को चोट",
+        "मरना चाहता",
+        "मरना चाहती",
+        "मर जाना चाहता",
+        "मर जाना चाहती",
+        "जीना नहीं चाहता",
+        "जीना नहीं चाहती",
+        "जीने का कोई मतलब नहीं",
+        "नाउम्मीद",
+    ],
+    "es": [
+        "suicidio",
+        "suicidarme",
+        "matarme",
+        "quiero morir",
+        "quiero morirme",
+        "hacerme daño",
+        "lastimarme",
+        "autolesión",
+        "cortarme",
+        "quitarme la vida",
+        "acabar con mi vida",
+        "no puedo más",
+        "sin esperanza",
+        "no valgo nada",
+        "sobredosis",
+    ],
+    "zh": [
+        "自杀",
+        "自殺",
+        "轻生",
+        "輕生",
+        "想死",
+        "不想活",
+        "活不下去",
+        "结束生命",
+        "結束生命",
+        "伤害自己",
+        "傷害自己",
+        "割腕",
+        "绝望",
+        "絕望",
+    ],
+    "ar": [
+        "انتحار",
+        "الانتحار",
+        "أنتحر",
+        "أقتل نفسي",
+        "أريد أن أموت",
+        "أؤذي نفسي",
+        "إيذاء نفسي",
+        "إيذاء النفس",
+        "لا أستطيع الاستمرار",
+        "فقدت الأمل",
+        "بلا قيمة",
+        "جرعة زائدة",
+    ],
+}
+# English words also match their inflections ("hopelessness", "overdosed"):
+# missing a crisis message costs more than a false positive
+crisis_keyword_scanner = LexiconScanner(
+    [*CRISIS_KEYWORDS_EN, *(term for terms in CRISIS_KEYWORDS_NATIVE.values() for term in terms)],
+    suffixes=INFLECTION_SUFFIXES,
+)
+
 HELPLINE_DIRECTORY = {
     "en": {
         "code": "US",
@@ -321,30 +463,24 @@ PEER_MODERATION_BLOCKLIST = [
     "threat",
 ]
 
-PEER_REPLY_TEMPLATES = [
-    "Thank you for sharing that with me. I’ve felt something similar, and taking things one moment at a time helped.",
-    "You’re doing really well by opening up. Would you like to try a grounding exercise together?",
-    "I hear you. It can be heavy, but you don’t have to carry it alone. I’m right here with you.",
-    "That sounds challenging. What’s one small kindness you could offer yourself today?",
-]
 
+def detect_crisis_keywords(*texts: Optional[str]) -> List[str]:
+    """Crisis terms (English or native hi/es/zh/ar) found as whole words in any of ``texts``."""
+    return crisis_keyword_scanner.scan(*texts)
 
-def detect_crisis_keywords(text: Optional[str]) -> List[str]:
-    if not text:
-        return []
-    lowered = text.lower()
-    hits: List[str] = []
-    for keyword in CRISIS_KEYWORDS_EN:
-        if keyword in lowered:
-            hits.append(keyword)
-    # Preserve order, remove duplicates
-    seen = set()
-    unique_hits = []
-    for item in hits:
-        if item not in seen:
-            seen.add(item)
-            unique_hits.append(item)
-    return unique_hits
+
+async def user_text_cacheable(user_id: str) -> bool:
+    """Whether a user's free text may be kept in the (in-memory) caches.
+
+    Templated strings are always cacheable; user text only when enabled
+    globally (LINGO_CACHE_USER_TEXT) and the user has not turned off data logging.
+    User text is looked up with ``persist=False``, so it never reaches the
+    on-disk translation cache.
+    """
+    if not LINGO_CACHE_USER_TEXT:
+        return False
+    settings = await storage.get_user_settings(user_id)
+    return settings is None or settings.dataLogging
 
 
 def get_helpline_for_language(language: Optional[str]) -> HelplineInfo:
@@ -355,6 +491,24 @@ def get_helpline_for_language(language: Optional[str]) -> HelplineInfo:
         data = HELPLINE_DIRECTORY.get(lang_code, HELPLINE_DIRECTORY["default"])
     return HelplineInfo(**data)
 
+@app.on_event("startup")
+async def warmup_analysis_executor():
+    # Parse the Haar cascades in every analysis worker before the first frame arrives
+    try:
+        await analysis_executor.warmup()
+    except Exception as e:
+        print(f"Face detector warmup failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_analysis_executor():
+    analysis_executor.shutdown()
+
+@app.on_event("shutdown")
+async def shutdown_lingo_clients():
+    await async_lingo_client.aclose()
+    await audio_http_client.aclose()
+    await llm_gateway.aclose()
+
 # CORS middleware
 # CORS for local dev (Vite) and same-origin deployments
 ALLOWED_ORIGINS = [
@@ -393,161 +547,396 @@ async def serve_favicon():
     raise HTTPException(status_code=404, detail="Favicon not found")
 
 # Mood Detection API
+MAX_FRAME_BYTES = int(os.getenv("MAX_FRAME_BYTES", str(8 * 1024 * 1024)))
+
+
+async def read_frame_body(http_request: Request) -> bytearray:
+    """Stream a raw image body into one buffer that cv2.imdecode can read in place."""
+    content_length = http_request.headers.get("content-length")
+    expected = int(content_length) if content_length and content_length.isdigit() else None
+    if expected is not None and expected > MAX_FRAME_BYTES:
+        raise HTTPException(status_code=413, detail="Frame is too large.")
+
+    if expected is not None:
+        # Preallocate and fill in place: no per-chunk joins or resizes
+        buffer = bytearray(expected)
+        view = memoryview(buffer)
+        received = 0
+        async for chunk in http_request.stream():
+            if received + len(chunk) > expected:
+                raise HTTPException(status_code=400, detail="Frame body longer than Content-Length.")
+            view[received:received + len(chunk)] = chunk
+            received += len(chunk)
+        view.release()
+        if received != expected:
+            del buffer[received:]
+    else:
+        buffer = bytearray()
+        async for chunk in http_request.stream():
+            buffer += chunk
+            if len(buffer) > MAX_FRAME_BYTES:
+                raise HTTPException(status_code=413, detail="Frame is too large.")
+
+    if not buffer:
+        raise HTTPException(status_code=400, detail="Request body must contain the image bytes.")
+    return buffer
+
+
+def request_deadline(http_request: Request) -> Optional[float]:
+    """``time.monotonic()`` deadline for this request, from the budget header or config.
+
+    A budget of ``0`` (or less) disables the deadline.
+    """
+    header = http_request.headers.get(REQUEST_BUDGET_HEADER)
+    try:
+        budget_ms = float(header) if header else MOOD_DETECT_BUDGET_MS
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{REQUEST_BUDGET_HEADER} must be a number of milliseconds.")
+    if budget_ms <= 0:
+        return None
+    return time.monotonic() + budget_ms / 1000
+
+
 @app.post("/api/mood/detect", response_model=MoodDetectionResponse)
-async def detect_mood(request: MoodDetectionRequest):
+async def detect_mood(request: MoodDetectionRequest, http_request: Request):
     """Detect mood from text and optionally face analysis."""
+    deadline = request_deadline(http_request)
+    face_job = None
+    if request.useWebcam and request.imageData:
+        face_job = (analyze_facial_expression, request.imageData, request.userId)
+    return await run_mood_detection(request, face_job, deadline=deadline)
+
+
+@app.post("/api/mood/detect/frame", response_model=MoodDetectionResponse)
+async def detect_mood_frame(
+    http_request: Request,
+    text: str = Query(default=""),
+    userId: str = Query(default="default"),
+    preferredLanguage: Optional[str] = Query(default=None),
+):
+    """Detect mood with the webcam frame sent as the raw body (``application/octet-stream``).
+
+    Same pipeline as ``/api/mood/detect`` but skips base64 and JSON parsing of
+    the image; text and user fields travel as query parameters.
+    """
+    deadline = request_deadline(http_request)
+    frame = await read_frame_body(http_request)
+    request = MoodDetectionRequest(
+        text=text,
+        useWebcam=True,
+        userId=userId,
+        preferredLanguage=preferredLanguage,
+    )
+    return await run_mood_detection(request, (analyze_facial_expression_bytes, frame, userId), deadline=deadline)
+
+
+@app.post("/api/mood/detect/burst", response_model=MoodDetectionResponse)
+async def detect_mood_burst(request: MoodBurstDetectionRequest, http_request: Request):
+    """Detect mood from a burst of webcam frames fused into one face vote.
+
+    The face cascade runs on the first (and every ``redetectEvery``-th) frame
+    only; other frames track the face and run just the smile/eye cascades.
+    """
+    deadline = request_deadline(http_request)
+    if not request.frames:
+        raise HTTPException(status_code=400, detail="At least one frame is required.")
+    redetect_every = FACE_REDETECT_EVERY if request.redetectEvery is None else request.redetectEvery
+    return await run_mood_detection(
+        request,
+        (analyze_facial_burst, request.frames, redetect_every),
+        extra_sources={"faceFrames": len(request.frames)},
+        deadline=deadline,
+    )
+
+
+def english_mood_message(fusion_result: MoodFusionResult) -> str:
+    return MOOD_MESSAGE_TEMPLATE.format(
+        mood=fusion_result.mood.value.capitalize(),
+        confidence=fusion_result.confidence,
+    )
+
+
+class TextInput(NamedTuple):
+    analysis_text: str
+    translated_text: Optional[str]
+    translated_language: Optional[str]
+    translation_applied: bool
+
+
+class CrisisAssessment(NamedTuple):
+    keywords: List[str]
+    reasons: List[str]
+    triggered: bool
+    negative_streak: int
+    helpline: Optional[HelplineInfo]
+
+
+async def run_mood_detection(
+    request: MoodDetectionRequest,
+    face_job: Optional[Tuple[Callable[..., FaceAnalysisResult], Any]] = None,
+    extra_sources: Optional[Dict[str, Any]] = None,
+    deadline: Optional[float] = None,
+) -> MoodDetectionResponse:
+    """Shared mood pipeline.
+
+    ``face_job`` is ``(analysis_fn, *args)`` run in the analysis executor when
+    the request carries camera input; each route picks the variant matching how
+    its frames arrive.
+
+    With a ``deadline`` (``time.monotonic()``), language detection,
+    translation, face analysis and localization give up once it passes and the
+    best available result is returned instead (e.g. text-only fusion, or
+    sentiment on the untranslated text); ``sources.skippedStages`` lists them.
+    Local work (text scoring, fusion, crisis checks, persisting) always runs.
+    """
     try:
         raw_text = request.text.strip()
-        original_language = None
-        translated_text = None
-        translated_language = None
-        translation_applied = False
 
-        analysis_text = ""
+        async def cacheable_stage() -> bool:
+            return await user_text_cacheable(request.userId) if raw_text else False
 
-        if raw_text:
-            analysis_text = raw_text
+        async def detect_stage(cache_user_text: bool) -> Optional[str]:
+            if not raw_text:
+                return None
             try:
-                detection_result = await asyncio.to_thread(
-                    lingo_client.detect_language, raw_text
+                detection_result = await async_lingo_client.detect_language(
+                    raw_text, cache=cache_user_text, persist=False
                 )
-                original_language = detection_result.get("language") or detection_result.get("detectedLanguage")
+                return detection_result.get("language") or detection_result.get("detectedLanguage")
             except Exception as e:
                 print(f"Language detection error: {e}")
+                return None
 
-            source_lang = original_language or "auto"
-            translated_language = original_language
-            if source_lang.lower() != DEFAULT_ANALYSIS_LANGUAGE:
-                try:
-                    translation_result = await asyncio.to_thread(
-                        lingo_client.translate,
-                        raw_text,
-                        source_lang,
-                        DEFAULT_ANALYSIS_LANGUAGE,
-                    )
-                    translated_text = translation_result.get("text") or raw_text
-                    analysis_text = translated_text
-                    translated_language = DEFAULT_ANALYSIS_LANGUAGE
-                    translation_applied = (
-                        translated_text.strip().lower() != raw_text.strip().lower()
-                        or source_lang.lower() != DEFAULT_ANALYSIS_LANGUAGE
-                    )
-                except Exception as e:
-                    print(f"Translation to English failed: {e}")
+        async def translate_stage(cache_user_text: bool, original_language: Optional[str]) -> TextInput:
+            translated_text = None
+            translated_language = None
+            translation_applied = False
+            analysis_text = raw_text
+            if raw_text:
+                source_lang = original_language or "auto"
+                translated_language = original_language
+                if source_lang.lower() != DEFAULT_ANALYSIS_LANGUAGE:
+                    try:
+                        translation_result = await async_lingo_client.translate(
+                            raw_text,
+                            source_lang,
+                            DEFAULT_ANALYSIS_LANGUAGE,
+                            cache=cache_user_text,
+                            persist=False,
+                        )
+                        translated_text = translation_result.get("text") or raw_text
+                        analysis_text = translated_text
+                        translated_language = DEFAULT_ANALYSIS_LANGUAGE
+                        translation_applied = (
+                            translated_text.strip().lower() != raw_text.strip().lower()
+                            or source_lang.lower() != DEFAULT_ANALYSIS_LANGUAGE
+                        )
+                    except Exception as e:
+                        print(f"Translation to English failed: {e}")
+                        translated_text = raw_text
+                        analysis_text = raw_text
+                else:
                     translated_text = raw_text
-                    analysis_text = raw_text
-            else:
-                translated_text = raw_text
-                translated_language = DEFAULT_ANALYSIS_LANGUAGE
-        else:
-            raw_text = ""
-
-        if translated_text is None:
-            translated_text = raw_text or None
-        if translated_language is None:
-            translated_language = (
-                DEFAULT_ANALYSIS_LANGUAGE
-                if (translated_text and (original_language is None or original_language.lower() == DEFAULT_ANALYSIS_LANGUAGE))
-                else original_language
+                    translated_language = DEFAULT_ANALYSIS_LANGUAGE
+
+            if translated_text is None:
+                translated_text = raw_text or None
+            if translated_language is None:
+                translated_language = (
+                    DEFAULT_ANALYSIS_LANGUAGE
+                    if (translated_text and (original_language is None or original_language.lower() == DEFAULT_ANALYSIS_LANGUAGE))
+                    else original_language
+                )
+            return TextInput(analysis_text, translated_text, translated_language, translation_applied)
+
+        def untranslated_input(cache_user_text: bool, original_language: Optional[str]) -> TextInput:
+            return TextInput(
+                raw_text,
+                raw_text or None,
+                original_language or (DEFAULT_ANALYSIS_LANGUAGE if raw_text else None),
+                False,
             )
 
-        # Analyze text sentiment (only if text is provided)
-        text_result = None
-        if analysis_text.strip():
-            text_result = analyze_text_sentiment(analysis_text)
-        
-        # Analyze face using real facial expression analysis
-        face_result = None
-        if request.useWebcam and request.imageData:
+        async def text_stage(text_input: TextInput) -> Optional[TextSentimentResult]:
+            # Analyze text sentiment (only if text is provided)
+            if not text_input.analysis_text.strip():
+                return None
+            return await analysis_executor.run(analyze_text_sentiment, text_input.analysis_text)
+
+        async def face_stage() -> Optional[FaceAnalysisResult]:
+            # Independent of the text path, so it overlaps detection and translation
+            if face_job is None:
+                return None
             try:
-                # Use real facial expression analysis
-                face_result = analyze_facial_expression(request.imageData)
+                return await analysis_executor.run(*face_job)
+            except AnalysisQueueFull:
+                raise
             except Exception as e:
                 print(f"Face analysis error: {e}")
                 # Fallback to mock analysis
-                face_result = mock_face_analysis()
-        
-        # Fuse the results
-        fusion_result = fuse_mood_analysis(text_result, face_result)
-        sources = dict(fusion_result.sources)
-        if translation_applied:
-            sources["translation"] = True
-        if original_language:
-            sources["detectedLanguage"] = original_language
-
-        keyword_hits = detect_crisis_keywords(analysis_text)
-        if translated_text and translated_text != analysis_text:
-            keyword_hits = list({kw: None for kw in (keyword_hits + detect_crisis_keywords(translated_text))}.keys())
-        if raw_text and raw_text != analysis_text:
-            keyword_hits = list({kw: None for kw in (keyword_hits + detect_crisis_keywords(raw_text))}.keys())
-
-        lookback_since = datetime.now() - timedelta(days=3)
-        historical_negative = await storage.count_negative_moods_since(
-            request.userId,
-            lookback_since,
-            min_confidence=80,
-        )
-        current_entry_negative = fusion_result.mood == MoodType.STRESSED and fusion_result.confidence >= 80
-        negative_streak = historical_negative + (1 if current_entry_negative else 0)
-
-        crisis_reasons: List[str] = []
-        if keyword_hits:
-            crisis_reasons.append("keywords")
-        if negative_streak >= 3:
-            crisis_reasons.append("streak")
-        crisis_flag = bool(crisis_reasons)
-        helpline_info = get_helpline_for_language(request.preferredLanguage or original_language) if crisis_flag else None
-        if crisis_flag:
-            sources["crisisFlag"] = True
+                return mock_face_analysis()
+
+        async def history_stage() -> int:
+            lookback_since = datetime.now() - timedelta(days=3)
+            return await storage.count_negative_moods_since(
+                request.userId,
+                lookback_since,
+                min_confidence=80,
+            )
 
-        # Save mood entry
-        from models import MoodEntryCreate
-        mood_entry_data = MoodEntryCreate(
-            userId=request.userId,
-            mood=fusion_result.mood,
-            confidence=fusion_result.confidence,
-            textInput=translated_text or raw_text or None,
-            faceAnalysis=str(face_result.dict()) if face_result else None,
-            originalText=raw_text or None,
-            originalLanguage=original_language,
-            translatedText=translated_text or None,
-            translatedLanguage=translated_language,
-            translationProvider="lingo" if translation_applied else None,
-            crisisFlag=crisis_flag,
-            crisisKeywords=keyword_hits or None,
-            crisisReasons=crisis_reasons or None,
-            negativeMoodStreak=negative_streak if crisis_flag else historical_negative,
-            helplineCode=helpline_info.code if helpline_info else None,
-            helplineName=helpline_info.name if helpline_info else None,
-            helplinePhone=helpline_info.phone if helpline_info else None,
-            helplineUrl=helpline_info.url if helpline_info else None,
-            helplineLanguage=helpline_info.language if helpline_info else None,
-        )
-        mood_entry = await storage.create_mood_entry(mood_entry_data)
+        async def fuse_stage(
+            text_result: Optional[TextSentimentResult],
+            face_result: Optional[FaceAnalysisResult],
+        ) -> MoodFusionResult:
+            return fuse_mood_analysis(text_result, face_result)
+
+        async def crisis_stage(
+            text_input: TextInput,
+            historical_negative: int,
+            fusion_result: MoodFusionResult,
+            original_language: Optional[str],
+        ) -> CrisisAssessment:
+            analysis_text, translated_text = text_input.analysis_text, text_input.translated_text
+            keyword_hits = detect_crisis_keywords(analysis_text, translated_text, raw_text)
+
+            current_entry_negative = fusion_result.mood == MoodType.STRESSED and fusion_result.confidence >= 80
+            negative_streak = historical_negative + (1 if current_entry_negative else 0)
+
+            crisis_reasons: List[str] = []
+            if keyword_hits:
+                crisis_reasons.append("keywords")
+            if negative_streak >= 3:
+                crisis_reasons.append("streak")
+            crisis_flag = bool(crisis_reasons)
+            helpline_info = get_helpline_for_language(request.preferredLanguage or original_language) if crisis_flag else None
+            return CrisisAssessment(
+                keyword_hits,
+                crisis_reasons,
+                crisis_flag,
+                negative_streak if crisis_flag else historical_negative,
+                helpline_info,
+            )
 
-        english_message = f"Your mood: {fusion_result.mood.value.capitalize()} ({fusion_result.confidence}% confidence)"
-        target_language = (
-            request.preferredLanguage
-            or original_language
-            or DEFAULT_ANALYSIS_LANGUAGE
-        )
-        localized_message = english_message
-        localized_language = DEFAULT_ANALYSIS_LANGUAGE
-        if target_language and target_language.lower() != DEFAULT_ANALYSIS_LANGUAGE:
+        async def persist_stage(
+            text_input: TextInput,
+            face_result: Optional[FaceAnalysisResult],
+            fusion_result: MoodFusionResult,
+            original_language: Optional[str],
+            crisis: CrisisAssessment,
+        ) -> MoodEntry:
+            helpline_info = crisis.helpline
+            mood_entry_data = MoodEntryCreate(
+                userId=request.userId,
+                mood=fusion_result.mood,
+                confidence=fusion_result.confidence,
+                textInput=text_input.translated_text or raw_text or None,
+                faceAnalysis=str(face_result.dict()) if face_result else None,
+                originalText=raw_text or None,
+                originalLanguage=original_language,
+                translatedText=text_input.translated_text or None,
+                translatedLanguage=text_input.translated_language,
+                translationProvider="lingo" if text_input.translation_applied else None,
+                crisisFlag=crisis.triggered,
+                crisisKeywords=crisis.keywords or None,
+                crisisReasons=crisis.reasons or None,
+                negativeMoodStreak=crisis.negative_streak,
+                helplineCode=helpline_info.code if helpline_info else None,
+                helplineName=helpline_info.name if helpline_info else None,
+                helplinePhone=helpline_info.phone if helpline_info else None,
+                helplineUrl=helpline_info.url if helpline_info else None,
+                helplineLanguage=helpline_info.language if helpline_info else None,
+            )
+            return await storage.create_mood_entry(mood_entry_data)
+
+        def localize_offline(
+            fusion_result: MoodFusionResult,
+            original_language: Optional[str],
+        ) -> Optional[Tuple[str, str]]:
+            # English or a catalog hit needs no network; also the deadline fallback
+            target_language = (
+                request.preferredLanguage
+                or original_language
+                or DEFAULT_ANALYSIS_LANGUAGE
+            )
+            if not target_language or target_language.lower() == DEFAULT_ANALYSIS_LANGUAGE:
+                return english_mood_message(fusion_result), DEFAULT_ANALYSIS_LANGUAGE
+            mood_name = fusion_result.mood.value.capitalize()
+            catalog_message = message_catalog.format(
+                MOOD_MESSAGE_TEMPLATE,
+                target_language,
+                mood=message_catalog.lookup(mood_name, target_language) or mood_name,
+                confidence=fusion_result.confidence,
+            )
+            if catalog_message is not None:
+                return catalog_message, target_language
+            return None
+
+        async def localize_stage(
+            fusion_result: MoodFusionResult,
+            original_language: Optional[str],
+        ) -> Tuple[str, str]:
+            offline = localize_offline(fusion_result, original_language)
+            if offline is not None:
+                return offline
+            english_message = english_mood_message(fusion_result)
+            target_language = request.preferredLanguage or original_language
             try:
-                translation_back = await asyncio.to_thread(
-                    lingo_client.translate,
+                translation_back = await async_lingo_client.translate(
                     english_message,
                     DEFAULT_ANALYSIS_LANGUAGE,
                     target_language,
                 )
-                localized_message = translation_back.get("text") or english_message
-                localized_language = target_language
+                return translation_back.get("text") or english_message, target_language
             except Exception as e:
                 print(f"Result translation error: {e}")
-        else:
-            localized_language = DEFAULT_ANALYSIS_LANGUAGE
-        
+                return english_message, DEFAULT_ANALYSIS_LANGUAGE
+
+        # Text branch (detect -> translate -> score), face analysis and the history
+        # lookup are independent; persisting and localizing both follow the fusion.
+        # Stages with a fallback degrade to it when the deadline passes.
+        graph = StageGraph()
+        graph.add("cacheable", cacheable_stage)
+        graph.add("detect", detect_stage, after=("cacheable",), fallback=lambda _cacheable: None)
+        graph.add("translate", translate_stage, after=("cacheable", "detect"), fallback=untranslated_input)
+        graph.add("text", text_stage, after=("translate",))
+        graph.add("face", face_stage, fallback=lambda: None)
+        graph.add("history", history_stage)
+        graph.add("fuse", fuse_stage, after=("text", "face"))
+        graph.add("crisis", crisis_stage, after=("translate", "history", "fuse", "detect"))
+        graph.add("persist", persist_stage, after=("translate", "face", "fuse", "detect", "crisis"))
+        graph.add(
+            "localize",
+            localize_stage,
+            after=("fuse", "detect"),
+            fallback=lambda fusion_result, language: (
+                localize_offline(fusion_result, language)
+                or (english_mood_message(fusion_result), DEFAULT_ANALYSIS_LANGUAGE)
+            ),
+        )
+        results = await graph.run(deadline)
+        mood_pipeline_timer.record(graph.timings, graph.skipped)
+
+        original_language = results["detect"]
+        text_input: TextInput = results["translate"]
+        face_result = results["face"]
+        fusion_result: MoodFusionResult = results["fuse"]
+        crisis: CrisisAssessment = results["crisis"]
+        mood_entry = results["persist"]
+        localized_message, localized_language = results["localize"]
+
+        sources = dict(fusion_result.sources)
+        if face_result is not None and extra_sources:
+            sources.update(extra_sources)
+        if text_input.translation_applied:
+            sources["translation"] = True
+        if original_language:
+            sources["detectedLanguage"] = original_language
+        if crisis.triggered:
+            sources["crisisFlag"] = True
+        if graph.skipped:
+            sources["skippedStages"] = list(graph.skipped)
+        sources["timingsMs"] = dict(graph.timings)
+
         return MoodDetectionResponse(
             mood=fusion_result.mood,
             confidence=fusion_result.confidence,
@@ -555,19 +944,21 @@ async def detect_mood(request: MoodDetectionRequest):
             entry=mood_entry,
             originalText=raw_text or None,
             originalLanguage=original_language,
-            translatedText=translated_text or None,
-            translatedLanguage=translated_language,
+            translatedText=text_input.translated_text or None,
+            translatedLanguage=text_input.translated_language,
             localizedMessage=localized_message,
             localizedLanguage=localized_language,
-            translationApplied=translation_applied,
+            translationApplied=text_input.translation_applied,
             crisis=CrisisSummary(
-                triggered=crisis_flag,
-                reasons=crisis_reasons,
-                keywords=keyword_hits,
-                negativeMoodStreak=negative_streak if crisis_flag else historical_negative,
-                helpline=helpline_info,
+                triggered=crisis.triggered,
+                reasons=crisis.reasons,
+                keywords=crisis.keywords,
+                negativeMoodStreak=crisis.negative_streak,
+                helpline=crisis.helpline,
             ),
         )
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         print(f"Mood detection error: {e}")
         import traceback
@@ -575,52 +966,173 @@ async def detect_mood(request: MoodDetectionRequest):
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
 
 
-async def generate_empathy_response(prompt: str) -> str:
-    fallback = random.choice(FALLBACK_EMPATHY_RESPONSES)
-    if not OPENAI_API_KEY:
-        return fallback
+MAX_BATCH_TEXTS = int(os.getenv("MAX_BATCH_TEXTS", "500"))
 
-    def _call() -> str:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": OPENAI_MODEL,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an empathetic, supportive mental health companion named MoodFlow. "
-                            "Respond with short, compassionate messages (max 3 sentences) that validate feelings, "
-                            "encourage gentle next steps, and never offer medical or legal advice."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                "temperature": 0.7,
-                "max_tokens": 220,
-            },
-            timeout=30,
+
+@app.post("/api/mood/detect/batch", response_model=MoodBatchDetectionResponse)
+async def detect_mood_batch(request: MoodBatchDetectionRequest):
+    """Score many (English) texts against the sentiment lexicon in one vectorized pass.
+
+    Skips language detection, translation, face analysis and crisis checks; meant
+    for backfilling and re-scoring historical entries. Set ``persist`` to false
+    to only score. At most ``MAX_BATCH_TEXTS`` texts per request.
+    """
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts in one batch (max {MAX_BATCH_TEXTS}).",
         )
-        response.raise_for_status()
-        data = response.json()
-        if data.get("choices"):
-            return data["choices"][0]["message"]["content"].strip()
+    try:
+        text_results = await analysis_executor.run(analyze_text_sentiment_batch, request.texts)
+        results: List[MoodBatchResult] = []
+        for text, text_result in zip(request.texts, text_results):
+            entry = None
+            if request.persist:
+                entry = await storage.create_mood_entry(
+                    MoodEntryCreate(
+                        userId=request.userId,
+                        mood=text_result.mood,
+                        confidence=text_result.confidence,
+                        textInput=text.strip() or None,
+                        originalText=text.strip() or None,
+                    )
+                )
+            results.append(
+                MoodBatchResult(
+                    mood=text_result.mood,
+                    confidence=text_result.confidence,
+                    entry=entry,
+                )
+            )
+        return MoodBatchDetectionResponse(results=results)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print(f"Batch mood detection error: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+
+
+EMPATHY_SYSTEM_PROMPT = (
+    "You are an empathetic, supportive mental health companion named MoodFlow. "
+    "Respond with short, compassionate messages (max 3 sentences) that validate feelings, "
+    "encourage gentle next steps, and never offer medical or legal advice."
+)
+
+
+def empathy_messages(prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": EMPATHY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def is_crisis_prompt(prompt: str, crisis: Optional[bool]) -> bool:
+    """``crisis`` as decided by the caller (which may have scanned the original,
+    untranslated message too), or else a scan of the English ``prompt``."""
+    return bool(detect_crisis_keywords(prompt)) if crisis is None else crisis
+
+
+def empathy_priority(crisis: bool) -> int:
+    return PRIORITY_CRISIS if crisis else PRIORITY_ROUTINE
+
+
+def empathy_cache_key(prompt: str, cache: bool, crisis: bool) -> Optional[str]:
+    """Cache key for a prompt, or ``None`` when the reply must be generated fresh."""
+    if not cache or crisis:
+        # Crisis messages always get a fresh, individual response
+        return None
+    return empathy_cache.key(prompt) or None
+
+
+async def generate_empathy_response(prompt: str, cache: bool = False, crisis: Optional[bool] = None) -> str:
+    """English empathy reply to ``prompt``, or a fallback response if OpenAI can't be used.
+
+    Crisis messages are sent at crisis priority and never answered from the
+    reply cache; ``crisis`` defaults to a keyword scan of ``prompt``.
+    """
+    fallback = random.choice(FALLBACK_EMPATHY_RESPONSES)
+    if not llm_gateway.enabled:
         return fallback
 
+    crisis = is_crisis_prompt(prompt, crisis)
+    cache_key = empathy_cache_key(prompt, cache, crisis)
+    if cache_key is not None:
+        cached = empathy_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
-        return await asyncio.to_thread(_call)
+        reply = await llm_gateway.complete(
+            empathy_messages(prompt),
+            priority=empathy_priority(crisis),
+            temperature=0.7,
+            max_tokens=220,
+        )
     except Exception as exc:
         print(f"Empathy generation failed: {exc}")
         return fallback
-
-
-@app.post("/api/chat/empathy", response_model=ChatMessageResponse)
-async def chat_empathy(request_data: ChatMessageRequest):
-    """Multilingual empathy chat companion."""
+    if not reply:
+        return fallback
+    if cache_key is not None:
+        empathy_cache.add(cache_key, reply)
+    return reply
+
+
+async def stream_empathy_tokens(
+    prompt: str, cache: bool = False, crisis: Optional[bool] = None
+) -> AsyncIterator[str]:
+    """Yield the OpenAI reply to ``prompt`` piece by piece as it is generated.
+
+    Raises when OpenAI can't be used (not configured, breaker open, HTTP
+    error); callers fall back to a canned response if nothing was yielded yet.
+    A cached reply is yielded in one piece; a completed stream is cached.
+    ``crisis`` works as in ``generate_empathy_response``.
+    """
+    if not llm_gateway.enabled:
+        raise RuntimeError("OpenAI is not configured (set OPENAI_API_KEY or OPENAI_BASE_URL).")
+    crisis = is_crisis_prompt(prompt, crisis)
+    cache_key = empathy_cache_key(prompt, cache, crisis)
+    if cache_key is not None:
+        cached = empathy_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    parts: List[str] = []
+    async for token in llm_gateway.stream(
+        empathy_messages(prompt),
+        priority=empathy_priority(crisis),
+        temperature=0.7,
+        max_tokens=220,
+    ):
+        parts.append(token)
+        yield token
+    reply = "".join(parts).strip()
+    if cache_key is not None and reply:
+        empathy_cache.add(cache_key, reply)
+
+
+class ChatInput(NamedTuple):
+    text: str
+    detected_language: Optional[str]
+    translated_text: str
+    translation_applied: bool
+    target_language: str
+    cacheable: bool
+    # Crisis terms in the English translation or the original message
+    crisis_keywords: List[str]
+
+    @property
+    def translate_back(self) -> bool:
+        return self.target_language != DEFAULT_ANALYSIS_LANGUAGE
+
+    @property
+    def crisis(self) -> bool:
+        return bool(self.crisis_keywords)
+
+
+async def prepare_chat_message(request_data: ChatMessageRequest) -> ChatInput:
+    """Detect the message language and translate it to English for the model."""
     incoming_text = request_data.message.strip()
     if not incoming_text:
         raise HTTPException(status_code=400, detail="Message cannot be empty.")
@@ -628,10 +1140,11 @@ async def chat_empathy(request_data: ChatMessageRequest):
     detected_language = None
     translated_to_en = incoming_text
     translation_to_en_applied = False
+    cache_user_text = await user_text_cacheable(request_data.userId)
 
     try:
-        detection = await asyncio.to_thread(
-            lingo_client.detect_language, incoming_text
+        detection = await async_lingo_client.detect_language(
+            incoming_text, cache=cache_user_text, persist=False
         )
         detected_language = detection.get("language") or detection.get("detectedLanguage")
     except Exception as exc:
@@ -639,11 +1152,12 @@ async def chat_empathy(request_data: ChatMessageRequest):
 
     if detected_language and detected_language.lower() != DEFAULT_ANALYSIS_LANGUAGE:
         try:
-            translation = await asyncio.to_thread(
-                lingo_client.translate,
+            translation = await async_lingo_client.translate(
                 incoming_text,
                 detected_language,
                 DEFAULT_ANALYSIS_LANGUAGE,
+                cache=cache_user_text,
+                persist=False,
             )
             translated_to_en = translation.get("text") or incoming_text
             translation_to_en_applied = True
@@ -651,29 +1165,49 @@ async def chat_empathy(request_data: ChatMessageRequest):
             print(f"Chat translation to English failed: {exc}")
             translated_to_en = incoming_text
 
-    empathy_text_en = await generate_empathy_response(translated_to_en)
-
     target_language = request_data.language or detected_language or DEFAULT_ANALYSIS_LANGUAGE
-    final_text = empathy_text_en
-    translation_back_applied = False
+    if target_language.lower() == DEFAULT_ANALYSIS_LANGUAGE:
+        target_language = DEFAULT_ANALYSIS_LANGUAGE
 
-    crisis_keyword_hits = detect_crisis_keywords(translated_to_en)
+    return ChatInput(
+        text=incoming_text,
+        detected_language=detected_language,
+        translated_text=translated_to_en,
+        translation_applied=translation_to_en_applied,
+        target_language=target_language,
+        cacheable=cache_user_text,
+        crisis_keywords=detect_crisis_keywords(translated_to_en, incoming_text),
+    )
+
+
+async def translate_empathy_reply(text_en: str, chat_input: ChatInput) -> Tuple[str, bool]:
+    """Translate (part of) an English reply into the chat's target language."""
+    # Fallback responses are fixed strings with catalog translations
+    catalog_text = message_catalog.lookup(text_en, chat_input.target_language)
+    if catalog_text is not None:
+        return catalog_text, True
+    try:
+        translation_back = await async_lingo_client.translate(
+            text_en,
+            DEFAULT_ANALYSIS_LANGUAGE,
+            chat_input.target_language,
+            cache=chat_input.cacheable,
+            persist=False,
+        )
+        return translation_back.get("text") or text_en, True
+    except Exception as exc:
+        print(f"Chat translation back failed: {exc}")
+        return text_en, False
 
-    if target_language.lower() != DEFAULT_ANALYSIS_LANGUAGE:
-        try:
-            translation_back = await asyncio.to_thread(
-                lingo_client.translate,
-                empathy_text_en,
-                DEFAULT_ANALYSIS_LANGUAGE,
-                target_language,
-            )
-            final_text = translation_back.get("text") or empathy_text_en
-            translation_back_applied = True
-        except Exception as exc:
-            print(f"Chat translation back failed: {exc}")
-            final_text = empathy_text_en
-    else:
-        target_language = DEFAULT_ANALYSIS_LANGUAGE
+
+async def finish_chat_response(
+    request_data: ChatMessageRequest,
+    chat_input: ChatInput,
+    final_text: str,
+    translation_back_applied: bool,
+) -> ChatMessageResponse:
+    """Attach crisis keywords, peer support suggestion and helpline to a reply."""
+    crisis_keyword_hits = chat_input.crisis_keywords
 
     peer_support_suggested = False
     try:
@@ -684,30 +1218,138 @@ async def chat_empathy(request_data: ChatMessageRequest):
     if crisis_keyword_hits:
         peer_support_suggested = True
 
-    helpline_info = get_helpline_for_language(request_data.language or detected_language) if crisis_keyword_hits else None
+    helpline_info = (
+        get_helpline_for_language(request_data.language or chat_input.detected_language)
+        if crisis_keyword_hits
+        else None
+    )
 
     return ChatMessageResponse(
         message=final_text,
-        language=target_language,
-        detectedLanguage=detected_language,
-        translationApplied=translation_to_en_applied or translation_back_applied,
+        language=chat_input.target_language,
+        detectedLanguage=chat_input.detected_language,
+        translationApplied=chat_input.translation_applied or translation_back_applied,
         peerSupportSuggested=peer_support_suggested,
         crisisKeywords=crisis_keyword_hits or None,
         helpline=helpline_info,
     )
 
 
+@app.post("/api/chat/empathy", response_model=ChatMessageResponse)
+async def chat_empathy(request_data: ChatMessageRequest):
+    """Multilingual empathy chat companion."""
+    chat_input = await prepare_chat_message(request_data)
+    empathy_text_en = await generate_empathy_response(
+        chat_input.translated_text, cache=chat_input.cacheable, crisis=chat_input.crisis
+    )
+
+    final_text = empathy_text_en
+    translation_back_applied = False
+    if chat_input.translate_back:
+        final_text, translation_back_applied = await translate_empathy_reply(empathy_text_en, chat_input)
+
+    return await finish_chat_response(request_data, chat_input, final_text, translation_back_applied)
+
+
+def sse_event(event: str, data: Any) -> str:
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def empathy_event_stream(request_data: ChatMessageRequest, chat_input: ChatInput) -> AsyncIterator[str]:
+    """SSE events for a streamed empathy reply.
+
+    English replies are forwarded token by token. For other languages each
+    sentence is sent to Lingo as soon as it is complete (while the model
+    keeps generating) and the translations are emitted in order. If OpenAI
+    fails before the first token or returns no text, a fallback response is
+    sent in one piece.
+    The last event, ``done``, carries the same body as ``/api/chat/empathy``.
+    """
+    sent: List[str] = []
+    translations: Deque["asyncio.Task[Tuple[str, bool]]"] = deque()
+    separators: Deque[str] = deque()
+    translation_back_applied = False
+    pending = ""
+    received = False
+
+    def _queue_sentence(sentence: str, separator: str) -> None:
+        translations.append(asyncio.ensure_future(translate_empathy_reply(sentence, chat_input)))
+        separators.append(separator)
+
+    async def _drain(wait: bool) -> AsyncIterator[str]:
+        nonlocal translation_back_applied
+        while translations and (wait or translations[0].done()):
+            text, applied = await translations.popleft()
+            translation_back_applied = translation_back_applied or applied
+            text += separators.popleft()
+            sent.append(text)
+            yield sse_event("delta", {"text": text})
+
+    try:
+        try:
+            async for token in stream_empathy_tokens(
+                chat_input.translated_text, cache=chat_input.cacheable, crisis=chat_input.crisis
+            ):
+                received = received or bool(token.strip())
+                if not chat_input.translate_back:
+                    sent.append(token)
+                    yield sse_event("delta", {"text": token})
+                    continue
+                pending += token
+                pieces = SENTENCE_END_RE.split(pending)
+                # split() alternates sentence, separator, ...; the tail is still being generated
+                for i in range(0, len(pieces) - 1, 2):
+                    _queue_sentence(pieces[i], pieces[i + 1])
+                pending = pieces[-1]
+                async for event in _drain(wait=False):
+                    yield event
+        except Exception as exc:
+            print(f"Empathy streaming failed: {exc}")
+        if not received:
+            # OpenAI failed before the first token, or finished without any text
+            pending = random.choice(FALLBACK_EMPATHY_RESPONSES)
+            if not chat_input.translate_back:
+                sent.append(pending)
+                yield sse_event("delta", {"text": pending})
+
+        if chat_input.translate_back and pending.strip():
+            _queue_sentence(pending.strip(), "")
+        async for event in _drain(wait=True):
+            yield event
+
+        response = await finish_chat_response(
+            request_data, chat_input, "".join(sent).strip(), translation_back_applied
+        )
+        yield sse_event("done", response.model_dump_json())
+    except Exception as exc:
+        print(f"Empathy event stream failed: {exc}")
+        yield sse_event("error", {"detail": "Failed to generate a response."})
+    finally:
+        for task in translations:
+            task.cancel()
+
+
+@app.post("/api/chat/empathy/stream")
+async def chat_empathy_stream(request_data: ChatMessageRequest):
+    """Streaming variant of ``/api/chat/empathy`` (Server-Sent Events).
+
+    Emits ``delta`` events (``{"text": ...}``) with the reply as it is
+    generated, then a ``done`` event with the full ``ChatMessageResponse``.
+    """
+    chat_input = await prepare_chat_message(request_data)
+    return StreamingResponse(
+        empathy_event_stream(request_data, chat_input),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/mood/tts", response_model=TextToSpeechResponse)
 async def mood_text_to_speech(payload: TextToSpeechRequest):
     """Return a speech audio url for a given text in the user's language."""
     try:
-        tts_result = await asyncio.to_thread(
-            lingo_client.text_to_speech,
-            payload.text,
-            payload.language,
-            payload.voice,
-        )
-        audio_url = tts_result.get("audioUrl") or tts_result.get("audio_url") or ""
+        audio_url = await synthesize_cached_audio(payload.text, payload.language, payload.voice)
         return TextToSpeechResponse(
             audioUrl=audio_url or "",
             language=payload.language,
@@ -717,6 +1359,70 @@ async def mood_text_to_speech(payload: TextToSpeechRequest):
         raise HTTPException(status_code=500, detail="Unable to generate speech audio.")
 
 
+async def download_audio(url: str, max_bytes: int) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Body and content type of ``url``, or ``None`` once it is known to exceed ``max_bytes``."""
+    async with audio_http_client.stream("GET", url) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type")
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            return None
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > max_bytes:
+                return None
+    return bytes(body), content_type
+
+
+async def synthesize_cached_audio(text: str, language: str, voice: Optional[str]) -> str:
+    """Local URL of the clip for (text, language, voice), synthesizing it on first use.
+
+    Falls back to Lingo's remote URL when the audio can't be downloaded or is
+    larger than ``TTS_MAX_DOWNLOAD_BYTES``.
+    """
+    key = tts_audio_cache.key(text, language, voice)
+    filename = tts_audio_cache.get(key)
+    if filename:
+        return f"{TTS_AUDIO_ROUTE}/{filename}"
+
+    async def _synthesize() -> str:
+        tts_result = await async_lingo_client.text_to_speech(text, language, voice)
+        remote_url = tts_result.get("audioUrl") or tts_result.get("audio_url") or ""
+        if not remote_url:
+            return ""
+        try:
+            downloaded = await download_audio(remote_url, TTS_MAX_DOWNLOAD_BYTES)
+            if downloaded is None:
+                print(f"TTS audio larger than {TTS_MAX_DOWNLOAD_BYTES} bytes; not caching it")
+                return remote_url
+            stored = await asyncio.to_thread(tts_audio_cache.put, key, *downloaded)
+        except Exception as exc:
+            print(f"TTS audio download failed: {exc}")
+            return remote_url
+        return f"{TTS_AUDIO_ROUTE}/{stored}"
+
+    # Concurrent first requests for the same clip share one synthesis + download
+    return await tts_audio_flight.do(key, _synthesize)
+
+
+@app.get(TTS_AUDIO_ROUTE + "/{filename}")
+async def get_tts_audio(filename: str):
+    """Serve a cached speech clip; names are content hashes, so they never change."""
+    if not AUDIO_FILE_RE.match(filename):
+        raise HTTPException(status_code=404, detail="Audio not found.")
+    path = tts_audio_cache.path(filename)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Audio not found.")
+    # Clips clients keep fetching stay at the recent end of the LRU
+    tts_audio_cache.touch(filename)
+    return FileResponse(
+        path,
+        media_type=AUDIO_MEDIA_TYPES[os.path.splitext(filename)[1]],
+        headers={"Cache-Control": TTS_AUDIO_CACHE_CONTROL},
+    )
+
+
 @app.post("/api/support/sms", response_model=SupportSMSResponse)
 async def send_support_sms(payload: SupportSMSRequest):
     """Stubbed endpoint to simulate sending crisis support SMS notifications."""
@@ -791,37 +1497,76 @@ async def peer_chat_message(payload: PeerChatRequest):
         raise HTTPException(status_code=404, detail="Peer session not found.")
 
     match: PeerMatch = session["match"]
+    cache_user_text = await user_text_cacheable(session["userId"])
 
-    # Detect original language of user message
-    detected_language = payload.language
-    try:
-        detection = await asyncio.to_thread(
-            lingo_client.detect_language,
-            payload.message,
+    moderation_flagged = contains_moderation_flag(payload.message)
+    moderation_message = None
+
+    if moderation_flagged:
+        moderation_message = (
+            message_catalog.lookup(PEER_MODERATION_NOTICE, payload.language) or PEER_MODERATION_NOTICE
         )
-        detected_language = detection.get("language") or detected_language
-    except Exception as exc:
-        print(f"Peer chat detection failed: {exc}")
 
-    # Translate user message into peer's language if needed
-    user_text_for_peer = payload.message
-    user_translated_from = None
-    detected_norm = (detected_language or DEFAULT_ANALYSIS_LANGUAGE).split("-")[0].lower()
+    # Compose peer reply (stubbed)
+    peer_reply_en = random.choice(PEER_REPLY_TEMPLATES)
+    if moderation_flagged:
+        peer_reply_en = PEER_MODERATED_REPLY
+
     match_lang_norm = match.language.split("-")[0].lower()
 
-    if detected_norm != match_lang_norm:
+    async def translate_user_message() -> Tuple[str, Optional[str]]:
+        # Detect original language of user message
+        detected_language = payload.language
+        try:
+            detection = await async_lingo_client.detect_language(
+                payload.message,
+                cache=cache_user_text,
+                persist=False,
+            )
+            detected_language = detection.get("language") or detected_language
+        except Exception as exc:
+            print(f"Peer chat detection failed: {exc}")
+
+        # Translate user message into peer's language if needed
+        detected_norm = (detected_language or DEFAULT_ANALYSIS_LANGUAGE).split("-")[0].lower()
+        if detected_norm == match_lang_norm:
+            return payload.message, None
         try:
-            translation = await asyncio.to_thread(
-                lingo_client.translate,
+            translation = await async_lingo_client.translate(
                 payload.message,
                 detected_language or DEFAULT_ANALYSIS_LANGUAGE,
                 match.language,
+                cache=cache_user_text,
+                persist=False,
             )
-            user_text_for_peer = translation.get("text") or payload.message
-            user_translated_from = detected_language
+            return translation.get("text") or payload.message, detected_language
         except Exception as exc:
             print(f"Peer chat user translation failed: {exc}")
-            user_text_for_peer = payload.message
+            return payload.message, None
+
+    async def translate_peer_reply() -> str:
+        # Translate peer reply to match's language if needed
+        if match_lang_norm == "en":
+            return peer_reply_en
+        catalog_reply = message_catalog.lookup(peer_reply_en, match.language)
+        if catalog_reply is not None:
+            return catalog_reply
+        try:
+            translation = await async_lingo_client.translate(
+                peer_reply_en,
+                "en",
+                match.language,
+            )
+            return translation.get("text") or peer_reply_en
+        except Exception as exc:
+            print(f"Peer reply translation to match language failed: {exc}")
+            return peer_reply_en
+
+    # The two legs are independent, so they run together (and share a translate batch)
+    (user_text_for_peer, user_translated_from), peer_reply_in_match_lang = await asyncio.gather(
+        translate_user_message(),
+        translate_peer_reply(),
+    )
 
     user_message = PeerChatMessage(
         sender="user",
@@ -831,44 +1576,25 @@ async def peer_chat_message(payload: PeerChatRequest):
     )
     await storage.append_peer_message(payload.sessionId, user_message)
 
-    moderation_flagged = contains_moderation_flag(payload.message)
-    moderation_message = None
-
-    if moderation_flagged:
-        moderation_message = (
-            "A moderator has flagged parts of this message. Please keep the space compassionate."
-        )
-
-    # Compose peer reply (stubbed)
-    peer_reply_en = random.choice(PEER_REPLY_TEMPLATES)
-    if moderation_flagged:
-        peer_reply_en = (
-            "I hear that you’re going through a lot. Let’s focus on keeping this conversation safe and kind."
-        )
-
-    # Translate peer reply to match's language if needed
-    peer_reply_in_match_lang = peer_reply_en
-    if match_lang_norm != "en":
-        try:
-            translation = await asyncio.to_thread(
-                lingo_client.translate,
-                peer_reply_en,
-                "en",
-                match.language,
-            )
-            peer_reply_in_match_lang = translation.get("text") or peer_reply_en
-        except Exception as exc:
-            print(f"Peer reply translation to match language failed: {exc}")
-            peer_reply_in_match_lang = peer_reply_en
-
     # Translate peer reply back to user language
     peer_reply_for_user = peer_reply_in_match_lang
     translated_from_lang = None
     target_lang_norm = payload.language.split("-")[0].lower()
-    if target_lang_norm != match_lang_norm:
+    # The reply is a fixed template, so the catalog can go straight from English
+    catalog_reply = (
+        message_catalog.lookup(peer_reply_en, payload.language)
+        if target_lang_norm not in (match_lang_norm, "en")
+        else None
+    )
+    if catalog_reply is not None:
+        peer_reply_for_user = catalog_reply
+        translated_from_lang = match.language
+    elif target_lang_norm == "en" and match_lang_norm != "en":
+        peer_reply_for_user = peer_reply_en
+        translated_from_lang = match.language
+    elif target_lang_norm != match_lang_norm:
         try:
-            translation = await asyncio.to_thread(
-                lingo_client.translate,
+            translation = await async_lingo_client.translate(
                 peer_reply_in_match_lang,
                 match.language,
                 payload.language,
@@ -1053,6 +1779,22 @@ async def get_meal_recommendations(mood: Optional[str] = Query(default=None)):
     except Exception as e:
         raise HTTPException(status_code=500, detail="Server error")
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime counters for tuning the analysis pipeline."""
+    return {
+        "analysisExecutor": analysis_executor.stats(),
+        "faceDetectors": cascade_pool.stats(),
+        "faceResultCache": FACE_RESULT_CACHE.stats(),
+        "lingo": async_lingo_client.stats(),
+        "messageCatalog": message_catalog.stats(),
+        "ttsAudioCache": tts_audio_cache.stats(),
+        "moodPipeline": mood_pipeline_timer.stats(),
+        "resilience": resilience_stats(),
+        "llmGateway": llm_gateway.stats(),
+        "empathyCache": empathy_cache.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 5000))
@@ -0,0 +1,81 @@
+import json
+import os
+import string
+import threading
+from typing import Any, Dict, Optional, Set
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "messages.json")
+
+
+def _placeholders(text: str) -> Set[str]:
+    return {name for _, name, _, _ in string.Formatter().parse(text) if name}
+
+
+def _base_language(language: str) -> str:
+    return language.split("-")[0].lower()
+
+
+class MessageCatalog:
+    """Pre-translated copies of the backend's fixed English strings.
+
+    Messages are keyed by their English source text (gettext style), so a call
+    site can ask for any string it is about to send to Lingo and only falls
+    back to the network when the catalog has no entry. Templates use
+    ``str.format`` placeholders (``{mood}``); a translation whose placeholders
+    don't match its source is dropped at load time.
+
+    The JSON file is produced offline by ``build_message_catalog.py``.
+    """
+
+    def __init__(self, messages: Optional[Dict[str, Dict[str, str]]] = None):
+        self.messages: Dict[str, Dict[str, str]] = {}
+        for source, translations in (messages or {}).items():
+            expected = _placeholders(source)
+            self.messages[source] = {
+                _base_language(language): text
+                for language, text in translations.items()
+                if _placeholders(text) == expected
+            }
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOG_PATH) -> "MessageCatalog":
+        """Load a catalog file; a missing file gives an empty catalog."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle).get("messages", {}))
+
+    @property
+    def languages(self) -> Set[str]:
+        return {language for translations in self.messages.values() for language in translations}
+
+    def lookup(self, source: str, language: str) -> Optional[str]:
+        """Return ``source`` translated into ``language``, or ``None`` if not in the catalog."""
+        text = self.messages.get(source, {}).get(_base_language(language))
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def format(self, template: str, language: str, **params: Any) -> Optional[str]:
+        """Translate ``template`` and fill in ``params``; ``None`` if not in the catalog."""
+        text = self.lookup(template, language)
+        return text.format(**params) if text is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "messages": len(self.messages),
+                "languages": sorted(self.languages),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def get_message_catalog() -> MessageCatalog:
+    return MessageCatalog.load(os.getenv("MESSAGE_CATALOG_PATH", DEFAULT_CATALOG_PATH))
@@ -0,0 +1,42 @@
+"""The backend's fixed English strings (response templates and canned replies).
+
+Kept free of side effects so ``build_message_catalog.py`` can read them
+without starting the app.
+"""
+from typing import List
+
+from models import MoodType
+
+MOOD_MESSAGE_TEMPLATE = "Your mood: {mood} ({confidence}% confidence)"
+
+FALLBACK_EMPATHY_RESPONSES = [
+    "I hear you. That sounds heavy, and it makes sense you'd feel that way. Let’s take this one small step at a time together. 💜",
+    "Thank you for trusting me with that. Your feelings matter, and I’m here to help you breathe through them.",
+    "It’s okay to feel exactly how you do right now. You’re not alone, and we can find a gentle next step whenever you’re ready.",
+]
+
+PEER_REPLY_TEMPLATES = [
+    "Thank you for sharing that with me. I’ve felt something similar, and taking things one moment at a time helped.",
+    "You’re doing really well by opening up. Would you like to try a grounding exercise together?",
+    "I hear you. It can be heavy, but you don’t have to carry it alone. I’m right here with you.",
+    "That sounds challenging. What’s one small kindness you could offer yourself today?",
+]
+
+PEER_MODERATED_REPLY = (
+    "I hear that you’re going through a lot. Let’s focus on keeping this conversation safe and kind."
+)
+PEER_MODERATION_NOTICE = (
+    "A moderator has flagged parts of this message. Please keep the space compassionate."
+)
+
+
+def catalog_sources() -> List[str]:
+    """Every string the message catalog should carry translations for."""
+    return [
+        MOOD_MESSAGE_TEMPLATE,
+        *(mood.value.capitalize() for mood in MoodType),
+        *FALLBACK_EMPATHY_RESPONSES,
+        *PEER_REPLY_TEMPLATES,
+        PEER_MODERATED_REPLY,
+        PEER_MODERATION_NOTICE,
+    ]
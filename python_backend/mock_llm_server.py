@@ -0,0 +1,66 @@
+"""Local stand-in for the OpenAI chat completions API, for testing without a key.
+
+    uvicorn mock_llm_server:app --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1 python main.py
+
+Answers ``POST /v1/chat/completions`` (plain or ``"stream": true``) with a
+canned supportive reply. ``MOCK_LLM_FIRST_TOKEN_MS`` / ``MOCK_LLM_TOKEN_MS``
+simulate model latency.
+"""
+import asyncio
+import json
+import os
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+MOCK_REPLY = (
+    "I hear you, and what you're feeling makes sense. "
+    "Let's take one slow breath together. "
+    "I'm here whenever you want to keep talking."
+)
+FIRST_TOKEN_SECONDS = float(os.getenv("MOCK_LLM_FIRST_TOKEN_MS", "300")) / 1000
+TOKEN_SECONDS = float(os.getenv("MOCK_LLM_TOKEN_MS", "20")) / 1000
+
+app = FastAPI(title="Mock LLM server")
+
+
+def _tokens(text: str):
+    words = text.split(" ")
+    return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "mock")
+    created = int(time.time())
+
+    if not body.get("stream"):
+        await asyncio.sleep(FIRST_TOKEN_SECONDS + TOKEN_SECONDS * len(_tokens(MOCK_REPLY)))
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": MOCK_REPLY}, "finish_reason": "stop"}
+            ],
+        }
+
+    async def events():
+        await asyncio.sleep(FIRST_TOKEN_SECONDS)
+        for token in _tokens(MOCK_REPLY):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(TOKEN_SECONDS)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -112,6 +112,10 @@ class MoodDetectionRequest(BaseModel):
     imageData: Optional[str] = None
     preferredLanguage: Optional[str] = None
 
+class MoodBurstDetectionRequest(MoodDetectionRequest):
+    frames: List[str]  # base64 frames (data URLs allowed) from one capture burst
+    redetectEvery: Optional[int] = Field(default=None, ge=0)  # 0 = detect on first frame only
+
 class TextSentimentResult(BaseModel):
     mood: MoodType
     confidence: int
@@ -140,6 +144,22 @@ class MoodDetectionResponse(BaseModel):
     crisis: Optional["CrisisSummary"] = None
 
 
+class MoodBatchDetectionRequest(BaseModel):
+    texts: List[str]
+    userId: str = Field(default="default")
+    persist: bool = True  # False => pure scoring, nothing is written to storage
+
+
+class MoodBatchResult(BaseModel):
+    mood: MoodType
+    confidence: int
+    entry: Optional[MoodEntry] = None
+
+
+class MoodBatchDetectionResponse(BaseModel):
+    results: List[MoodBatchResult]
+
+
 class ChatMessageRequest(BaseModel):
     message: str
     userId: str = Field(default="default")
@@ -1,14 +1,40 @@
 import base64
+from bisect import bisect_right
 import io
+import os
 import numpy as np
 from PIL import Image
 import cv2
-from typing import Optional
-import difflib
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from models import MoodType, TextSentimentResult, FaceAnalysisResult, MoodFusionResult
+from keyword_matching import FuzzyKeywordIndex, KeywordAutomaton
+from face_detectors import cascade_pool
+from caching import LRUCache
 import random
 import hashlib
 
+# Frames are analyzed at this width (pixels); larger captures are downscaled first
+FACE_WORKING_WIDTH = int(os.getenv("FACE_WORKING_WIDTH", "640"))
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+HEADER_PEEK_BYTES = 64 * 1024
+# Bursts run the full face cascade every N frames and track the face in between
+FACE_REDETECT_EVERY = int(os.getenv("FACE_REDETECT_EVERY", "5"))
+FACE_TRACKING_MIN_SCORE = 0.5
+
+# Per user: face boxes for (perceptually) identical frames, and expression
+# results for identical face crops, e.g. a user pressing detect twice
+FACE_RESULT_CACHE = LRUCache(
+    max_size=int(os.getenv("FACE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("FACE_CACHE_TTL_SECONDS", "10")),
+)
+# Face crops are hashed on a 16x16 DCT block (256 bits), fine enough that a
+# change of expression changes the key
+FACE_ROI_HASH_SIZE = 16
+
 # Sentiment keywords for mood detection
 SENTIMENT_KEYWORDS = {
     "calm": ["calm", "peaceful", "relaxed", "serene", "tranquil", "quiet", "still", "gentle", "content", "restful", "chill", "zen", "peace", "quiet", "soothing", "mellow"],
@@ -18,136 +44,407 @@ SENTIMENT_KEYWORDS = {
     "neutral": ["neutral", "okay", "fine", "normal", "average", "regular", "standard", "typical", "ordinary", "balanced", "meh", "whatever", "alright", "decent", "so-so", "nothing special"]
 }
 
+# Whole lexicon compiled once so each text is scanned a single time for every mood
+SENTIMENT_AUTOMATON = KeywordAutomaton(
+    keyword for keywords in SENTIMENT_KEYWORDS.values() for keyword in keywords
+)
+# Typo-tolerant index at the lowest fuzzy threshold (0.8); callers grade the ratio
+SENTIMENT_FUZZY_INDEX = FuzzyKeywordIndex(SENTIMENT_AUTOMATON.keywords, threshold=0.8)
+
+# One column per distinct keyword; the membership matrix counts how often each
+# keyword is listed under each mood, so texts x keywords credits reduce to
+# texts x moods scores in a single product
+SENTIMENT_MOODS = list(SENTIMENT_KEYWORDS)
+SENTIMENT_COLUMNS = {keyword: column for column, keyword in enumerate(SENTIMENT_AUTOMATON.keywords)}
+SENTIMENT_MEMBERSHIP = np.zeros((len(SENTIMENT_COLUMNS), len(SENTIMENT_MOODS)), dtype=np.int64)
+for _mood_index, _keywords in enumerate(SENTIMENT_KEYWORDS.values()):
+    for _keyword in _keywords:
+        SENTIMENT_MEMBERSHIP[SENTIMENT_COLUMNS[_keyword], _mood_index] += 1
+
+# Keyword credits in tenths (integers, so sums are exact in any order):
+# direct hit, close fuzzy match (ratio >= 0.9), typo-level fuzzy match
+DIRECT_CREDIT = 10
+CLOSE_CREDIT = 9
+TYPO_CREDIT = 6
+
+MOOD_MAPPING = {
+    "calm": MoodType.CALM,
+    "energized": MoodType.ENERGIZED,
+    "stressed": MoodType.STRESSED,
+    "focused": MoodType.FOCUSED,
+    "neutral": MoodType.NEUTRAL,
+}
+
+def _tokenize(lowercase_text: str) -> List[str]:
+    words = [w.strip(".,!?:;()[]{}\"'\n\r\t") for w in lowercase_text.split()]
+    return [w for w in words if w]
+
+def _fuzzy_credit(ratio: float) -> int:
+    # Anything below 0.9 tolerates small typos like "happpy"
+    return CLOSE_CREDIT if ratio >= 0.9 else TYPO_CREDIT
+
+def _keyword_credits(lowercase_text: str, words: List[str]) -> Dict[str, int]:
+    """Credit earned by each lexicon keyword: a direct hit, or a fuzzy word match."""
+    credits = {keyword: DIRECT_CREDIT for keyword in SENTIMENT_AUTOMATON.find(lowercase_text)}
+
+    # Fuzzy compare each word to the lexicon; a keyword takes the ratio of the
+    # first word (in text order) that lands within the typo threshold
+    for w in words:
+        for keyword, ratio in SENTIMENT_FUZZY_INDEX.matches(w).items():
+            if keyword not in credits:
+                credits[keyword] = _fuzzy_credit(ratio)
+    return credits
+
+def _sentiment_confidence(max_score, word_count):
+    # Confidence from relative score strength and word count normalization
+    # (scalars for one text, arrays for a batch)
+    total_words = np.maximum(1, word_count)
+    normalized = max_score / (total_words / 8)  # denser signals => higher confidence
+    return np.clip(normalized * 100, 60, 97).astype(int)
+
 def analyze_text_sentiment(text: str) -> TextSentimentResult:
     """Analyze text sentiment with keyword and fuzzy matching (typo tolerant)."""
     if not text.strip():
         return TextSentimentResult(mood=MoodType.NEUTRAL, confidence=50)
 
     lowercase_text = text.lower()
-    words = [w.strip(".,!?:;()[]{}\"'\n\r\t") for w in lowercase_text.split()]
-    words = [w for w in words if w]
+    words = _tokenize(lowercase_text)
+    credits = _keyword_credits(lowercase_text, words)
 
-    mood_scores = {}
+    mood_scores = {
+        mood: sum(credits.get(keyword, 0) for keyword in keywords)
+        for mood, keywords in SENTIMENT_KEYWORDS.items()
+    }
 
-    for mood, keywords in SENTIMENT_KEYWORDS.items():
-        score = 0.0
-        # Direct substring hit adds full point
-        for keyword in keywords:
-            if keyword in lowercase_text:
-                score += 1.0
-                continue
-            # Fuzzy compare each word to keyword, grant partial credit
-            for w in words:
-                if not w:
-                    continue
-                ratio = difflib.SequenceMatcher(None, w, keyword).ratio()
-                if ratio >= 0.9:
-                    score += 0.9
-                    break
-                elif ratio >= 0.8:  # tolerates small typos like "happpy"
-                    score += 0.6
-                    break
-        mood_scores[mood] = score
-
-    max_score = max(mood_scores.values()) if mood_scores else 0
-    if max_score <= 0:
+    max_credit = max(mood_scores.values()) if mood_scores else 0
+    if max_credit <= 0:
         return TextSentimentResult(mood=MoodType.NEUTRAL, confidence=55)
 
     detected_mood = max(mood_scores, key=mood_scores.get)
+    detected_mood_enum = MOOD_MAPPING.get(detected_mood, MoodType.NEUTRAL)
+    confidence = int(_sentiment_confidence(max_credit / 10, len(words)))
 
-    mood_mapping = {
-        "calm": MoodType.CALM,
-        "energized": MoodType.ENERGIZED,
-        "stressed": MoodType.STRESSED,
-        "focused": MoodType.FOCUSED,
-        "neutral": MoodType.NEUTRAL,
-    }
-    detected_mood_enum = mood_mapping.get(detected_mood, MoodType.NEUTRAL)
+    return TextSentimentResult(mood=detected_mood_enum, confidence=confidence)
 
-    # Confidence from relative score strength and word count normalization
-    total_words = max(1, len(words))
-    normalized = max_score / (total_words / 8)  # denser signals => higher confidence
-    confidence = int(min(97, max(60, normalized * 100)))
+def _direct_hits(lowered: List[str], credits: np.ndarray) -> None:
+    """Credit every keyword occurring (as a substring) in each text, one scan per keyword.
 
-    return TextSentimentResult(mood=detected_mood_enum, confidence=confidence)
+    The texts are joined with NUL separators (never part of a keyword); after a
+    hit the search resumes at the next text, so each keyword costs one pass
+    over the batch plus one step per text containing it.
+    """
+    joined = "\0".join(lowered)
+    starts = [0]
+    for text in lowered[:-1]:
+        starts.append(starts[-1] + len(text) + 1)
+    last = len(starts) - 1
+    for keyword, column in SENTIMENT_COLUMNS.items():
+        position = joined.find(keyword)
+        while position != -1:
+            row = bisect_right(starts, position) - 1
+            credits[row, column] = DIRECT_CREDIT
+            position = joined.find(keyword, starts[row + 1]) if row < last else -1
+
+def analyze_text_sentiment_batch(texts: List[str]) -> List[TextSentimentResult]:
+    """Score many texts at once; returns the same results as ``analyze_text_sentiment`` per text.
+
+    Direct keyword hits are found with one scan of the whole batch per keyword,
+    and fuzzy matches are looked up once per distinct word. The resulting
+    texts x keywords credit matrix is reduced to texts x moods scores with one
+    product against ``SENTIMENT_MEMBERSHIP``; argmax and confidence
+    normalization then run vectorized over all texts.
+    """
+    if not texts:
+        return []
+
+    lowered = [text.lower() for text in texts]
+    tokens = [_tokenize(text) for text in lowered]
+    blank = np.array([not text.strip() for text in texts])
+
+    credits = np.zeros((len(texts), len(SENTIMENT_COLUMNS)), dtype=np.int64)
+    _direct_hits(lowered, credits)
+
+    fuzzy: Dict[str, List[Tuple[int, int]]] = {}
+    for word in {word for words in tokens for word in words}:
+        matches = SENTIMENT_FUZZY_INDEX.matches(word)
+        if matches:
+            fuzzy[word] = [(SENTIMENT_COLUMNS[keyword], _fuzzy_credit(ratio)) for keyword, ratio in matches.items()]
+    if fuzzy:
+        for row, words in enumerate(tokens):
+            # Direct hits and earlier words keep their credit
+            for word in words:
+                for column, credit in fuzzy.get(word, ()):
+                    if not credits[row, column]:
+                        credits[row, column] = credit
+
+    scores = credits @ SENTIMENT_MEMBERSHIP
+    max_credits = scores.max(axis=1)
+    best = scores.argmax(axis=1)
+    confidences = _sentiment_confidence(max_credits / 10, np.array([len(words) for words in tokens]))
+
+    results = []
+    for row in range(len(texts)):
+        if blank[row]:
+            results.append(TextSentimentResult(mood=MoodType.NEUTRAL, confidence=50))
+        elif max_credits[row] <= 0:
+            results.append(TextSentimentResult(mood=MoodType.NEUTRAL, confidence=55))
+        else:
+            results.append(TextSentimentResult(
+                mood=MOOD_MAPPING.get(SENTIMENT_MOODS[best[row]], MoodType.NEUTRAL),
+                confidence=int(confidences[row]),
+            ))
+    return results
+
+class PreparedFrame(NamedTuple):
+    """Grayscale frame ready for the cascades, plus how to map boxes back."""
+    gray: np.ndarray  # downscaled to the working width and histogram-equalized
+    scale: float  # original pixels per working pixel
+    original_size: Tuple[int, int]  # (width, height) as captured
+
+def _peek_image_size(image_bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from the image header without decoding pixels."""
+    try:
+        # Only the leading bytes are copied; markers past them just disable reduced decode
+        header_bytes = bytes(memoryview(image_bytes)[:HEADER_PEEK_BYTES])
+        with Image.open(io.BytesIO(header_bytes)) as header:
+            return header.size
+    except Exception:
+        return None
+
+def prepare_frame(image_bytes, working_width: int = FACE_WORKING_WIDTH) -> PreparedFrame:
+    """Decode a frame straight to grayscale at (roughly) the working resolution.
+
+    When the header says the frame is at least 2x/4x/8x wider than the working
+    width, OpenCV's reduced decode is used (JPEG scales during the IDCT, so the
+    full-size image is never materialized); any remaining excess is removed
+    with an area resize. The histogram is then equalized to make the cascades
+    less sensitive to webcam exposure.
+    """
+    size = _peek_image_size(image_bytes)
+    flag, reduction = cv2.IMREAD_GRAYSCALE, 1
+    if size and working_width > 0:
+        for factor, reduced_flag in REDUCED_DECODE_FLAGS:
+            if size[0] // factor >= working_width:
+                flag, reduction = reduced_flag, factor
+                break
+
+    np_arr = np.frombuffer(image_bytes, np.uint8)
+    gray = cv2.imdecode(np_arr, flag)
+    if gray is None:
+        raise ValueError("Failed to decode image")
 
-def analyze_facial_expression(image_data: str) -> FaceAnalysisResult:
+    original_size = size or (gray.shape[1] * reduction, gray.shape[0] * reduction)
+    if working_width > 0 and gray.shape[1] > working_width:
+        working_height = max(1, round(gray.shape[0] * working_width / gray.shape[1]))
+        gray = cv2.resize(gray, (working_width, working_height), interpolation=cv2.INTER_AREA)
+    gray = cv2.equalizeHist(gray)
+
+    return PreparedFrame(gray=gray, scale=original_size[0] / gray.shape[1], original_size=original_size)
+
+def frame_phash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """DCT perceptual hash of ``hash_size``² bits: low-frequency coefficients above their median."""
+    side = hash_size * 4
+    small = cv2.resize(gray, (side, side), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:hash_size, :hash_size].flatten()
+    bits = low > np.median(low[1:])  # DC term skews the median
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def _to_original(boxes, scale: float) -> List[Tuple[int, int, int, int]]:
+    """Map (x, y, w, h) boxes from working to original pixel coordinates."""
+    return [tuple(int(round(v * scale)) for v in box) for box in boxes]
+
+def _classify_expression(face_box, smiles, eyes) -> FaceAnalysisResult:
+    """Mood heuristics over a face box and its ROI-relative smile/eye boxes."""
+    _, _, w, h = face_box
+
+    # Heuristics with stricter thresholds
+    # Strong smile → energized (requires sufficiently large smile area)
+    if len(smiles) > 0:
+        sx, sy, sw, sh = smiles[0]
+        smile_w_ratio = sw / max(1, w)
+        smile_h_ratio = sh / max(1, h)
+        smile_area_ratio = (sw * sh) / max(1, w * h)
+        print(f"[OpenCV] smile ratios: w={smile_w_ratio:.3f} h={smile_h_ratio:.3f} area={smile_area_ratio:.3f}")
+        if smile_w_ratio >= 0.35 and smile_h_ratio >= 0.12 and smile_area_ratio >= 0.05:
+            return FaceAnalysisResult(mood=MoodType.ENERGIZED, confidence=90)
+
+    if len(eyes) >= 2:
+        # Use eye positions to approximate sad/angry
+        eye_y_positions = [ey for (_, ey, _, _) in eyes[:2]]
+        avg_eye_y = sum(eye_y_positions) / len(eye_y_positions)
+        mid_face_y = h / 2.0
+
+        if avg_eye_y > mid_face_y * 1.1:
+            # Eyes lower than mid => droopy look -> sad -> stressed
+            return FaceAnalysisResult(mood=MoodType.STRESSED, confidence=75)
+        if avg_eye_y < mid_face_y * 0.9:
+            # Eyes higher than mid => furrowed -> angry -> stressed
+            return FaceAnalysisResult(mood=MoodType.STRESSED, confidence=70)
+
+        # Eye area ratio for "surprise" → map to focused, not energized
+        eye_area = sum([ew * eh for (_, _, ew, eh) in eyes])
+        face_area = max(1, w * h)
+        eye_area_ratio = eye_area / face_area
+        print(f"[OpenCV] eye_area_ratio={eye_area_ratio:.3f}")
+        if eye_area_ratio > 0.055:
+            return FaceAnalysisResult(mood=MoodType.FOCUSED, confidence=78)
+
+    # Default to neutral when signals are weak
+    return FaceAnalysisResult(mood=MoodType.NEUTRAL, confidence=65)
+
+def decode_image_data(image_data: str) -> bytes:
+    """Decode a base64 frame, with or without a ``data:image/...`` URL prefix."""
+    # Clean up base64 prefix if present
+    if image_data.startswith("data:image"):
+        image_data = image_data.split(",")[1]
+    return base64.b64decode(image_data)
+
+def analyze_facial_expression(image_data: str, cache_scope: str = "") -> FaceAnalysisResult:
+    """Analyze a base64 (optionally data-URL) encoded frame; see ``analyze_facial_expression_bytes``."""
+    try:
+        image_bytes = decode_image_data(image_data)
+    except Exception as e:
+        print(f"Error in image analysis (OpenCV): {e}")
+        return mock_face_analysis()
+    return analyze_facial_expression_bytes(image_bytes, cache_scope)
+
+def analyze_facial_expression_bytes(image_bytes, cache_scope: str = "") -> FaceAnalysisResult:
     """Analyze facial expression using OpenCV Haar cascades.
 
+    ``image_bytes`` is any buffer holding the encoded image (bytes, bytearray,
+    memoryview); it is handed to ``cv2.imdecode`` without copying.
+
+    Cache entries are scoped by ``cache_scope`` (the user id). A perceptually
+    identical frame reuses the detected face box; the expression result is
+    only reused for a matching hash of the face crop itself, so a new smile
+    is always re-analyzed.
+
     Heuristic approach inspired by smile and eye features:
     - Smile => happy -> energized
     - Two eyes and geometry heuristics => sad/angry/surprise
     - Otherwise => neutral
     """
     try:
-        # Clean up base64 prefix if present
-        if image_data.startswith("data:image"):
-            image_data = image_data.split(",")[1]
-
-        image_bytes = base64.b64decode(image_data)
-        np_arr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        if img is None:
-            raise ValueError("Failed to decode image")
-
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        frame = prepare_frame(image_bytes)
+        gray = frame.gray
 
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-        eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml")
-        smile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_smile.xml")
-
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=4)
-        print(f"[OpenCV] faces_detected={len(faces)} img_shape={gray.shape}")
-        if len(faces) == 0:
+        frame_key = ("face", cache_scope, frame_phash(gray))
+        face = FACE_RESULT_CACHE.get(frame_key)
+        if face is None:
+            face_cascade, _, _ = cascade_pool.get()
+            faces = face_cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=4)
+            print(f"[OpenCV] faces_detected={len(faces)} img_shape={gray.shape} scale={frame.scale:.2f}")
+            # An empty tuple records "no face" for this frame
+            face = tuple(int(v) for v in faces[0]) if len(faces) else ()
+            FACE_RESULT_CACHE.set(frame_key, face)
+        if not face:
             # No face detected; fall back to neutral low confidence
             return FaceAnalysisResult(mood=MoodType.NEUTRAL, confidence=55)
 
-        x, y, w, h = faces[0]
-        roi_gray = gray[y:y+h, x:x+w]
-
-        smiles = smile_cascade.detectMultiScale(roi_gray, scaleFactor=1.7, minNeighbors=18)
-        eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.2, minNeighbors=4)
-        print(f"[OpenCV] smiles={len(smiles)} eyes={len(eyes)} face_w_h=({w},{h})")
-
-        # Heuristics with stricter thresholds
-        # Strong smile → energized (requires sufficiently large smile area)
-        if len(smiles) > 0:
-            sx, sy, sw, sh = smiles[0]
-            smile_w_ratio = sw / max(1, w)
-            smile_h_ratio = sh / max(1, h)
-            smile_area_ratio = (sw * sh) / max(1, w * h)
-            print(f"[OpenCV] smile ratios: w={smile_w_ratio:.3f} h={smile_h_ratio:.3f} area={smile_area_ratio:.3f}")
-            if smile_w_ratio >= 0.35 and smile_h_ratio >= 0.12 and smile_area_ratio >= 0.05:
-                return FaceAnalysisResult(mood=MoodType.ENERGIZED, confidence=90)
-
-        if len(eyes) >= 2:
-            # Use eye positions to approximate sad/angry
-            eye_y_positions = [ey for (_, ey, _, _) in eyes[:2]]
-            avg_eye_y = sum(eye_y_positions) / len(eye_y_positions)
-            mid_face_y = h / 2.0
-
-            if avg_eye_y > mid_face_y * 1.1:
-                # Eyes lower than mid => droopy look -> sad -> stressed
-                return FaceAnalysisResult(mood=MoodType.STRESSED, confidence=75)
-            if avg_eye_y < mid_face_y * 0.9:
-                # Eyes higher than mid => furrowed -> angry -> stressed
-                return FaceAnalysisResult(mood=MoodType.STRESSED, confidence=70)
-
-            # Eye area ratio for "surprise" → map to focused, not energized
-            eye_area = sum([ew * eh for (_, _, ew, eh) in eyes])
-            face_area = max(1, w * h)
-            eye_area_ratio = eye_area / face_area
-            print(f"[OpenCV] eye_area_ratio={eye_area_ratio:.3f}")
-            if eye_area_ratio > 0.055:
-                return FaceAnalysisResult(mood=MoodType.FOCUSED, confidence=78)
-
-        # Default to neutral when signals are weak
-        return FaceAnalysisResult(mood=MoodType.NEUTRAL, confidence=65)
+        x, y, w, h = face
+        roi_hash = frame_phash(gray[y:y+h, x:x+w], hash_size=FACE_ROI_HASH_SIZE)
+        expression_key = ("expression", cache_scope, roi_hash)
+        cached = FACE_RESULT_CACHE.get(expression_key)
+        if cached is not None:
+            return cached.model_copy()
+
+        result = _analyze_face_roi(frame, face)
+        FACE_RESULT_CACHE.set(expression_key, result)
+        return result.model_copy()
 
     except Exception as e:
         print(f"Error in image analysis (OpenCV): {e}")
         return mock_face_analysis()
 
+def _analyze_face_roi(frame: PreparedFrame, face) -> FaceAnalysisResult:
+    """Run the smile/eye cascades inside a face box (working coords) and classify."""
+    _, eye_cascade, smile_cascade = cascade_pool.get()
+    x, y, w, h = face
+    roi_gray = frame.gray[y:y+h, x:x+w]
+
+    smiles = smile_cascade.detectMultiScale(roi_gray, scaleFactor=1.7, minNeighbors=18)
+    eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.2, minNeighbors=4)
+
+    # Heuristics run on original-resolution geometry
+    face_box = _to_original([face], frame.scale)[0]
+    smiles = _to_original(smiles, frame.scale)
+    eyes = _to_original(eyes, frame.scale)
+    print(f"[OpenCV] smiles={len(smiles)} eyes={len(eyes)} face_w_h=({face_box[2]},{face_box[3]})")
+
+    return _classify_expression(face_box, smiles, eyes)
+
+def _track_face(gray: np.ndarray, template: np.ndarray, previous) -> Optional[Tuple[int, int, int, int]]:
+    """Find last frame's face patch near its previous position; None if the match is weak."""
+    x, y, w, h = previous
+    pad_x, pad_y = w // 2, h // 2
+    x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+    x1, y1 = min(gray.shape[1], x + w + pad_x), min(gray.shape[0], y + h + pad_y)
+    window = gray[y0:y1, x0:x1]
+    if window.shape[0] < template.shape[0] or window.shape[1] < template.shape[1]:
+        return None
+
+    scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+    _, best_score, _, best_loc = cv2.minMaxLoc(scores)
+    if best_score < FACE_TRACKING_MIN_SCORE:
+        return None
+    return (x0 + best_loc[0], y0 + best_loc[1], w, h)
+
+def analyze_facial_burst(frames: List, redetect_every: int = FACE_REDETECT_EVERY) -> FaceAnalysisResult:
+    """Analyze a burst of frames (base64 strings or raw bytes) from the same capture.
+
+    The full-frame face cascade only runs on the first frame and then every
+    ``redetect_every``-th frame (``0`` = first frame only). In between, the face
+    is tracked by template matching around its last position, and only the
+    smile/eye cascades run inside the tracked box. Tracking falls back to a
+    full detection whenever the match is weak. Per-frame results are fused into
+    one confidence-weighted vote.
+    """
+    face_cascade, _, _ = cascade_pool.get()
+    results: List[FaceAnalysisResult] = []
+    face = None
+    template = None
+    detections = 0
+
+    for index, data in enumerate(frames):
+        try:
+            frame = prepare_frame(decode_image_data(data) if isinstance(data, str) else data)
+        except Exception as e:
+            print(f"Skipping undecodable burst frame {index}: {e}")
+            continue
+
+        redetect = redetect_every > 0 and index % redetect_every == 0
+        if face is not None and template is not None and not redetect:
+            face = _track_face(frame.gray, template, face)
+        else:
+            face = None
+        if face is None:
+            detections += 1
+            faces = face_cascade.detectMultiScale(frame.gray, scaleFactor=1.2, minNeighbors=4)
+            if len(faces) == 0:
+                template = None
+                results.append(FaceAnalysisResult(mood=MoodType.NEUTRAL, confidence=55))
+                continue
+            face = tuple(int(v) for v in faces[0])
+
+        x, y, w, h = face
+        template = frame.gray[y:y+h, x:x+w]
+        results.append(_analyze_face_roi(frame, face))
+
+    print(f"[OpenCV] burst frames={len(frames)} analyzed={len(results)} full_detections={detections}")
+    if not results:
+        return mock_face_analysis()
+    return fuse_face_results(results)
+
+def fuse_face_results(results: List[FaceAnalysisResult]) -> FaceAnalysisResult:
+    """Confidence-weighted vote; reports the mean confidence of the frames backing the winner."""
+    weights: Dict[MoodType, float] = {}
+    votes: Dict[MoodType, int] = {}
+    for result in results:
+        weights[result.mood] = weights.get(result.mood, 0) + result.confidence
+        votes[result.mood] = votes.get(result.mood, 0) + 1
+    mood = max(weights, key=weights.get)
+    return FaceAnalysisResult(mood=mood, confidence=int(round(weights[mood] / votes[mood])))
+
 def mock_face_analysis() -> FaceAnalysisResult:
     """Mock face analysis implementation."""
     moods = list(MoodType)
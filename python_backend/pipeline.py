@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+class StageTimer:
+    """Rolling per-stage latency statistics for a pipeline (count, mean, p50/p95, max, skips)."""
+
+    def __init__(self, window: int = 512):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._skips: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, float], skipped: Sequence[str] = ()) -> None:
+        with self._lock:
+            for name, elapsed_ms in timings.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(elapsed_ms)
+                self._counts[name] = self._counts.get(name, 0) + 1
+            for name in skipped:
+                self._skips[name] = self._skips.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = {}
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                summary[name] = {
+                    "count": self._counts[name],
+                    "meanMs": round(sum(ordered) / len(ordered), 2),
+                    "p50Ms": round(ordered[len(ordered) // 2], 2),
+                    "p95Ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                    "maxMs": round(ordered[-1], 2),
+                    "skipped": self._skips.get(name, 0),
+                }
+            return summary
+
+
+class StageGraph:
+    """A small DAG of async stages, each started as soon as its dependencies finish.
+
+    ``add(name, fn, after=(...))`` registers ``fn``, which is awaited with the
+    results of the ``after`` stages as positional arguments. ``run`` starts
+    every stage at once (each waits only on its own dependencies), so
+    independent branches overlap and the total latency approaches the longest
+    branch. If any stage raises, the remaining stages are cancelled and the
+    error propagates; stages that should tolerate failures handle them
+    themselves and return a fallback.
+
+    ``timings`` holds each stage's own running time in milliseconds (time
+    spent waiting for dependencies excluded) plus the graph ``total``.
+
+    ``run(deadline=...)`` bounds the graph by a ``time.monotonic()`` deadline.
+    A stage registered with a ``fallback`` (called with the same inputs) is
+    cut off when the deadline passes, or not started at all if it has already
+    passed, and its fallback result is used instead; its name is added to
+    ``skipped``. Stages without a fallback are required and always run to
+    completion.
+    """
+
+    def __init__(self):
+        self._stages: List[Tuple[str, Callable[..., Awaitable[Any]], Sequence[str], Optional[Callable[..., Any]]]] = []
+        self.timings: Dict[str, float] = {}
+        self.skipped: List[str] = []
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        after: Sequence[str] = (),
+        fallback: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        known = {stage[0] for stage in self._stages}
+        missing = [dependency for dependency in after if dependency not in known]
+        if missing:
+            raise ValueError(f"Stage {name!r} depends on unknown stages {missing}")
+        self._stages.append((name, fn, tuple(after), fallback))
+
+    async def run(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Run the graph and return ``{stage: result}``."""
+        started = time.perf_counter()
+        tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+        async def _run_stage(
+            name: str,
+            fn: Callable[..., Awaitable[Any]],
+            after: Sequence[str],
+            fallback: Optional[Callable[..., Any]],
+        ) -> Any:
+            inputs = [await tasks[dependency] for dependency in after]
+            stage_started = time.perf_counter()
+            try:
+                if fallback is None or deadline is None:
+                    return await fn(*inputs)
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    try:
+                        return await asyncio.wait_for(fn(*inputs), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                self.skipped.append(name)
+                return fallback(*inputs)
+            finally:
+                self.timings[name] = round((time.perf_counter() - stage_started) * 1000, 2)
+
+        for name, fn, after, fallback in self._stages:
+            tasks[name] = asyncio.ensure_future(_run_stage(name, fn, after, fallback))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self.timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Every breaker / hedger built here, by name, for /api/metrics
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_hedgers: Dict[str, "Hedger"] = {}
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a dependency that keeps failing or stalling.
+
+    - closed: calls go through. A failure, or a call still running after
+      ``slow_call_seconds``, counts against the dependency; any fast success
+      resets the count. ``failure_threshold`` in a row trips the breaker.
+    - open: calls fail immediately with ``CircuitOpen`` (callers take their
+      fallback path) for ``reset_timeout`` seconds.
+    - half-open: up to ``half_open_max`` probe calls go through; a success
+      closes the breaker, a failure opens it again.
+
+    Slow calls are counted when the threshold passes, not when they finally
+    return, so a hanging upstream trips the breaker without waiting out the
+    HTTP timeout. Meant to be used from the event loop (not thread-safe).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_seconds: Optional[float] = None,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.calls = 0
+        self.rejected = 0
+        self.trips = 0
+        _breakers[name] = self
+
+    def admit(self) -> bool:
+        """Admit a call (returns whether it is a half-open probe) or raise ``CircuitOpen``.
+
+        For calls that can't go through ``call`` (e.g. streams): follow with
+        ``record_success`` / ``record_failure`` and then ``release(probe)``.
+        """
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpen(f"{self.name} circuit is open; skipping call.")
+            self.state = "half_open"
+            self._probes = 0
+        if self.state == "half_open":
+            if self._probes >= self.half_open_max:
+                self.rejected += 1
+                raise CircuitOpen(f"{self.name} circuit is half-open; probe already in flight.")
+            self._probes += 1
+            self.calls += 1
+            return True
+        self.calls += 1
+        return False
+
+    def release(self, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        probe = self.admit()
+        slow = False
+
+        def _mark_slow() -> None:
+            nonlocal slow
+            slow = True
+            self.record_failure()
+
+        timer = None
+        if self.slow_call_seconds:
+            timer = asyncio.get_running_loop().call_later(self.slow_call_seconds, _mark_slow)
+        try:
+            result = await fn(*args)
+        except Exception:
+            if not slow:
+                self.record_failure()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.release(probe)
+        if not slow:
+            self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "trips": self.trips,
+        }
+
+
+class Hedger:
+    """Hedged requests for idempotent calls.
+
+    Starts the call; if it hasn't finished after ``delay`` seconds, starts a
+    second identical one (up to ``attempts`` in total) and returns whichever
+    succeeds first, cancelling the rest. An attempt that fails early makes the
+    next one start right away. Cuts tail latency from a slow replica or
+    connection at the cost of a few duplicate upstream calls.
+    """
+
+    def __init__(self, name: str, delay: float, attempts: int = 2):
+        self.name = name
+        self.delay = delay
+        self.attempts = attempts
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        _hedgers[name] = self
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        pending: List["asyncio.Future[T]"] = [asyncio.ensure_future(fn())]
+        first = pending[0]
+        started = 1
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                timeout = self.delay if started < self.attempts else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+                # Nothing back within the delay, or the attempts in flight failed
+                if started < self.attempts and (not done or not pending):
+                    pending.append(asyncio.ensure_future(fn()))
+                    started += 1
+                    self.hedged += 1
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "delayMs": self.delay * 1000,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+        }
+
+
+def breaker_from_env(prefix: str, name: str) -> CircuitBreaker:
+    """Build a breaker from ``<prefix>_BREAKER_*`` environment variables."""
+    slow_ms = float(os.getenv(f"{prefix}_BREAKER_SLOW_MS", "5000"))
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv(f"{prefix}_BREAKER_FAILURES", "5")),
+        slow_call_seconds=slow_ms / 1000 if slow_ms > 0 else None,
+        reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET_SECONDS", "30")),
+    )
+
+
+def resilience_stats() -> Dict[str, Any]:
+    return {
+        "breakers": {name: breaker.stats() for name, breaker in _breakers.items()},
+        "hedging": {name: hedger.stats() for name, hedger in _hedgers.items()},
+    }
@@ -1,5 +1,9 @@
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from bisect import bisect_left, insort, insort_left
+from collections import deque
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Deque, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta
 import uuid
 from models import (
     User,
@@ -18,6 +22,85 @@ from models import (
     PeerChatMessage,
 )
 
+NEGATIVE_MOODS = {MoodType.STRESSED}
+# Shape of the streak checks the counters answer without scanning
+NEGATIVE_STREAK_MIN_CONFIDENCE = 80
+NEGATIVE_STREAK_WINDOW = timedelta(days=3)
+RECENT_MOOD_WINDOW = 10
+
+_timestamp = itemgetter(0)
+_entry_timestamp = attrgetter("timestamp")
+
+
+class NegativeMoodCounter:
+    """Rolling negative-mood counts for one user, updated as entries are created.
+
+    - ``recent``: whether each of the last ``RECENT_MOOD_WINDOW`` moods was
+      negative, plus a running total.
+    - ``negative``: ``(timestamp, confidence)`` of negative moods with at least
+      ``NEGATIVE_STREAK_MIN_CONFIDENCE``, oldest first. Entries older than
+      ``NEGATIVE_STREAK_WINDOW`` expire; ``horizon`` is the oldest time the
+      list is still complete from.
+
+    The ``count_*`` methods return ``None`` for queries the counters can't
+    answer exactly (a longer window, a lower confidence threshold), and the
+    caller falls back to scanning the entries.
+    """
+
+    def __init__(self):
+        self.recent: Deque[bool] = deque(maxlen=RECENT_MOOD_WINDOW)
+        self.recent_negative = 0
+        self.negative: List[Tuple[datetime, int]] = []
+        self.horizon: Optional[datetime] = None
+
+    def add(self, entry: MoodEntry) -> None:
+        is_negative = entry.mood in NEGATIVE_MOODS
+        if len(self.recent) == self.recent.maxlen and self.recent[0]:
+            self.recent_negative -= 1
+        self.recent.append(is_negative)
+        self.recent_negative += is_negative
+        if is_negative and entry.confidence >= NEGATIVE_STREAK_MIN_CONFIDENCE:
+            insort(self.negative, (entry.timestamp, entry.confidence), key=_timestamp)
+        self.expire(entry.timestamp - NEGATIVE_STREAK_WINDOW)
+
+    def reset_recent(self, entries: List[MoodEntry]) -> None:
+        """Rebuild ``recent`` from the user's newest entries (oldest first), e.g. after an out-of-order insert."""
+        self.recent.clear()
+        self.recent.extend(entry.mood in NEGATIVE_MOODS for entry in entries[-RECENT_MOOD_WINDOW:])
+        self.recent_negative = sum(self.recent)
+
+    def expire(self, cutoff: datetime) -> None:
+        """Forget negative moods older than ``cutoff``."""
+        if self.horizon is not None and cutoff <= self.horizon:
+            return
+        expired = bisect_left(self.negative, cutoff, key=_timestamp)
+        if expired:
+            del self.negative[:expired]
+        self.horizon = cutoff
+
+    def count_since(self, since: datetime, min_confidence: int) -> Optional[int]:
+        if min_confidence < NEGATIVE_STREAK_MIN_CONFIDENCE:
+            return None
+        if self.horizon is not None and since < self.horizon:
+            return None
+        # Expire up to ``since`` at most, so an equally old query still sees everything
+        self.expire(min(since, datetime.now() - NEGATIVE_STREAK_WINDOW))
+        start = bisect_left(self.negative, since, key=_timestamp)
+        if min_confidence == NEGATIVE_STREAK_MIN_CONFIDENCE:
+            return len(self.negative) - start
+        return sum(1 for _, confidence in self.negative[start:] if confidence >= min_confidence)
+
+    def count_recent(self, limit: int) -> Optional[int]:
+        if limit <= 0:
+            return None
+        if limit >= len(self.recent):
+            if limit > RECENT_MOOD_WINDOW and len(self.recent) == self.recent.maxlen:
+                # Older moods have rotated out of the window
+                return None
+            return self.recent_negative
+        return sum(islice(reversed(self.recent), limit))
+
+
 class MemStorage:
     def __init__(self):
         self.users: Dict[str, User] = {}
@@ -26,6 +109,9 @@ class MemStorage:
         self.user_settings: Dict[str, UserSettings] = {}
         self.peer_profiles: List[PeerMatch] = []
         self.peer_sessions: Dict[str, Dict[str, any]] = {}
+        self.negative_mood_counters: Dict[str, NegativeMoodCounter] = {}
+        # Each user's mood entries in timestamp order (oldest first)
+        self.mood_index: Dict[str, List[MoodEntry]] = {}
         self._seed_data()
 
     def _seed_data(self):
@@ -144,34 +230,43 @@ class MemStorage:
             **entry_data.dict()
         )
         self.mood_entries[entry_id] = entry
+        user_entries = self.mood_index.setdefault(entry.userId, [])
+        counter = self.negative_mood_counters.setdefault(entry.userId, NegativeMoodCounter())
+        counter.add(entry)
+        if user_entries and entry.timestamp <= user_entries[-1].timestamp:
+            # Ties go before older entries, so newest-first reads keep insertion order among them
+            insort_left(user_entries, entry, key=_entry_timestamp)
+            # The entry isn't necessarily the newest in history order; realign the recent window
+            counter.reset_recent(user_entries)
+        else:
+            user_entries.append(entry)
         return entry
 
     async def get_mood_history(self, user_id: str, limit: int = 10) -> List[MoodEntry]:
-        entries = [
-            entry for entry in self.mood_entries.values()
-            if entry.userId == user_id
-        ]
-        entries.sort(key=lambda x: x.timestamp, reverse=True)
-        return entries[:limit]
+        entries = self.mood_index.get(user_id, [])
+        if limit <= 0:
+            return entries[::-1][:limit]
+        return entries[-limit:][::-1]
 
     async def get_latest_mood(self, user_id: str) -> Optional[MoodEntry]:
-        history = await self.get_mood_history(user_id, 1)
-        return history[0] if history else None
+        entries = self.mood_index.get(user_id)
+        return entries[-1] if entries else None
 
     async def count_recent_negative_moods(self, user_id: str, limit: int = 10) -> int:
         """Count recent moods considered negative (e.g. stressed)."""
+        counter = self.negative_mood_counters.get(user_id)
+        if counter is None:
+            return 0
+        count = counter.count_recent(limit)
+        if count is not None:
+            return count
         history = await self.get_mood_history(user_id, limit)
-        negative_moods = {MoodType.STRESSED}
-        return sum(1 for entry in history if entry.mood in negative_moods)
+        return sum(1 for entry in history if entry.mood in NEGATIVE_MOODS)
 
     async def get_mood_entries_since(self, user_id: str, since: datetime) -> List[MoodEntry]:
-        entries = [
-            entry
-            for entry in self.mood_entries.values()
-            if entry.userId == user_id and entry.timestamp >= since
-        ]
-        entries.sort(key=lambda x: x.timestamp, reverse=True)
-        return entries
+        entries = self.mood_index.get(user_id, [])
+        start = bisect_left(entries, since, key=_entry_timestamp)
+        return entries[start:][::-1]
 
     async def count_negative_moods_since(
         self,
@@ -179,6 +274,12 @@ class MemStorage:
         since: datetime,
         min_confidence: int = 80,
     ) -> int:
+        counter = self.negative_mood_counters.get(user_id)
+        if counter is None:
+            return 0
+        count = counter.count_since(since, min_confidence)
+        if count is not None:
+            return count
         entries = await self.get_mood_entries_since(user_id, since)
         return sum(
             1
@@ -0,0 +1,56 @@
+import os
+from typing import Tuple
+
+import audio_cache
+from audio_cache import AudioCache
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def _cache(tmp_path, monkeypatch, grace: float = 60.0) -> Tuple[AudioCache, FakeTime]:
+    clock = FakeTime(1_000_000.0)
+    monkeypatch.setattr(audio_cache, "time", clock)
+    return AudioCache(str(tmp_path), max_bytes=300, grace=grace), clock
+
+
+def _put(cache: AudioCache, clock: FakeTime, name: str) -> str:
+    clock.now += 1
+    return cache.put(AudioCache.key(name, "en"), b"x" * 100, "audio/mpeg")
+
+
+def test_serving_a_clip_keeps_it_from_eviction(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, grace=0)
+    first = _put(cache, clock, "one")
+    second = _put(cache, clock, "two")
+    _put(cache, clock, "three")
+    assert cache.touch(first)
+
+    _put(cache, clock, "four")
+    assert os.path.exists(cache.path(first))
+    assert not os.path.exists(cache.path(second))
+    assert cache.stats()["bytes"] == 300
+
+
+def test_recently_returned_clips_are_not_deleted(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, grace=60)
+    names = [_put(cache, clock, str(i)) for i in range(5)]
+    # Everything was handed out within the grace period: over the cap, nothing deleted
+    assert all(os.path.exists(cache.path(name)) for name in names)
+    assert cache.stats()["bytes"] == 500
+
+    clock.now += 120
+    newest = _put(cache, clock, "later")
+    assert os.path.exists(cache.path(newest))
+    assert cache.stats()["files"] == 3
+    assert cache.stats()["bytes"] == 300
+
+
+def test_touch_unknown_file(tmp_path, monkeypatch):
+    cache, _ = _cache(tmp_path, monkeypatch)
+    assert not cache.touch("0" * 64 + ".mp3")
@@ -0,0 +1,112 @@
+import json
+from typing import Any, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from caching import RotatingResponseCache
+from llm_gateway import PRIORITY_CRISIS, PRIORITY_ROUTINE
+
+TRANSLATION = "I can't take it anymore"
+WARMUP_MESSAGES = ["estoy harta de todo", "ya no aguanto el trabajo", "todo me cansa"]
+CRISIS_MESSAGE = "no puedo más"
+
+
+class FakeGateway:
+    """Stands in for the LLM gateway: numbered replies, recording each call's priority."""
+
+    enabled = True
+
+    def __init__(self):
+        self.priorities: List[int] = []
+
+    def _reply(self, priority: int) -> str:
+        self.priorities.append(priority)
+        return f"reply {len(self.priorities) - 1}"
+
+    async def complete(self, messages, priority: int = PRIORITY_ROUTINE, **params: Any) -> str:
+        return self._reply(priority)
+
+    async def stream(self, messages, priority: int = PRIORITY_ROUTINE, **params: Any):
+        yield self._reply(priority)
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    fake = FakeGateway()
+    monkeypatch.setattr(main, "llm_gateway", fake)
+    monkeypatch.setattr(main, "empathy_cache", RotatingResponseCache(variants=len(WARMUP_MESSAGES)))
+
+    async def detect_language(text, **kwargs):
+        return {"language": "es"}
+
+    async def translate(text, source_lang, target_lang, **kwargs):
+        # Every message (and reply) comes back as the same English prompt, so
+        # the warm-up messages fill the reply cache for the crisis message too
+        return {"text": TRANSLATION if target_lang == "en" else text}
+
+    monkeypatch.setattr(main.async_lingo_client, "detect_language", detect_language)
+    monkeypatch.setattr(main.async_lingo_client, "translate", translate)
+    return fake
+
+
+def _chat(client: TestClient, message: str) -> dict:
+    response = client.post("/api/chat/empathy", json={"message": message, "userId": "crisis-test"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _chat_stream(client: TestClient, message: str) -> dict:
+    response = client.post("/api/chat/empathy/stream", json={"message": message, "userId": "crisis-test"})
+    assert response.status_code == 200
+    events = [block.split("\n", 1) for block in response.text.strip().split("\n\n")]
+    event, data = events[-1]
+    assert event == "event: done"
+    return json.loads(data[len("data: "):])
+
+
+@pytest.mark.parametrize("send", [_chat, _chat_stream], ids=["json", "sse"])
+def test_native_crisis_message_skips_cache_and_jumps_queue(gateway, send):
+    client = TestClient(main.app)
+    for message in WARMUP_MESSAGES:
+        assert not send(client, message).get("crisisKeywords")
+    assert gateway.priorities == [PRIORITY_ROUTINE] * len(WARMUP_MESSAGES)
+
+    body = send(client, CRISIS_MESSAGE)
+    # A fresh reply, generated at crisis priority, not one of the cached ones
+    assert gateway.priorities[-1] == PRIORITY_CRISIS
+    assert len(gateway.priorities) == len(WARMUP_MESSAGES) + 1
+    assert body["message"] == f"reply {len(WARMUP_MESSAGES)}"
+    assert body["crisisKeywords"] == [CRISIS_MESSAGE]
+    assert body["helpline"] is not None
+
+    # The cache is warm: an ordinary message is answered without the model
+    send(client, WARMUP_MESSAGES[0])
+    assert len(gateway.priorities) == len(WARMUP_MESSAGES) + 1
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("a deep feeling of hopelessness", ["hopeless"]),
+        ("I feel hopelessly stuck", ["hopeless"]),
+        ("my worthlessness", ["worthless"]),
+        ("I think he overdosed", ["overdose"]),
+        ("I keep thinking about dying", ["die"]),
+        ("I'm giving up", ["give up"]),
+        ("thoughts of self-harming", ["self harm"]),
+        ("suicidal thoughts", ["suicidal"]),
+        ("killing myself", ["kill myself"]),
+    ],
+)
+def test_crisis_keywords_match_inflected_forms(text, expected):
+    assert main.detect_crisis_keywords(text) == expected
+
+
+@pytest.mark.parametrize("text", ["starting a new diet", "my uncle was a soldier", "diesel prices"])
+def test_crisis_keywords_stay_whole_word(text):
+    assert main.detect_crisis_keywords(text) == []
@@ -0,0 +1,142 @@
+import difflib
+import random
+
+import pytest
+
+from keyword_matching import FuzzyKeywordIndex
+from models import MoodType, TextSentimentResult
+from mood_analysis import (
+    MOOD_MAPPING,
+    SENTIMENT_AUTOMATON,
+    SENTIMENT_KEYWORDS,
+    analyze_text_sentiment,
+    analyze_text_sentiment_batch,
+)
+
+KEYWORDS = SENTIMENT_AUTOMATON.keywords
+
+TYPO_WORDS = [
+    "happpy", "hapy", "hpapy", "stresed", "stressd", "anxous", "axnious", "overwhelmd",
+    "exausted", "exhuasted", "frustated", "depresed", "tird", "trired", "calmm", "clam",
+    "relaxd", "peacefull", "focussed", "fcused", "motivatd", "excitd", "awsome", "amazng",
+    "wonderfull", "okey", "alrite", "nervus", "worreid", "misrable", "sadd", "angyr",
+    "so-soo", "zenn", "meh", "blah", "a", "i", "supercalifragilistic", "xxxxxxxxxxxxxxxxxxxxxxxx",
+]
+
+TYPO_TEXTS = [
+    "I feel so happpy and relaxd today",
+    "Super stresed and overwhelmd with work, totally exausted",
+    "Feeling calmm, peacefull and kind of zenn",
+    "im fcused and motivatd, productve day ahead",
+    "meh, just an okey day, nothing specal",
+    "So anxous and nervus about tomorow, can't sleep",
+    "wonderfull amazng awsome trip!!!",
+    "I am sad, tird and frustated. Everything is hard.",
+    "",
+    "   ",
+    "the quick brown fox jumps over the lazy dog",
+]
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edit = rng.choice(("insert", "delete", "replace", "swap"))
+    if edit == "insert":
+        return word[:i] + letter + word[i:]
+    if edit == "delete" and len(word) > 1:
+        return word[:i] + word[i + 1:]
+    if edit == "swap" and i + 1 < len(word):
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + letter + word[i + 1:]
+
+
+def _generated_corpus(count: int = 300, seed: int = 7):
+    rng = random.Random(seed)
+    filler = ["today", "really", "very", "i", "am", "feel", "and", "so", "work", "the"]
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 10)):
+            if rng.random() < 0.5:
+                words.append(_typo(rng.choice(KEYWORDS), rng))
+            else:
+                words.append(rng.choice(filler))
+        texts.append(" ".join(words))
+    return texts
+
+
+def _baseline_matches(word: str, threshold: float):
+    matches = {}
+    for keyword in KEYWORDS:
+        ratio = difflib.SequenceMatcher(None, word, keyword).ratio()
+        if ratio >= threshold:
+            matches[keyword] = ratio
+    return matches
+
+
+def _baseline_sentiment(text: str) -> TextSentimentResult:
+    """The difflib loop ``analyze_text_sentiment`` used before the fuzzy index."""
+    if not text.strip():
+        return TextSentimentResult(mood=MoodType.NEUTRAL, confidence=50)
+
+    lowercase_text = text.lower()
+    words = [w.strip(".,!?:;()[]{}\"'\n\r\t") for w in lowercase_text.split()]
+    words = [w for w in words if w]
+
+    mood_scores = {}
+    for mood, keywords in SENTIMENT_KEYWORDS.items():
+        score = 0.0
+        for keyword in keywords:
+            if keyword in lowercase_text:
+                score += 1.0
+                continue
+            for w in words:
+                ratio = difflib.SequenceMatcher(None, w, keyword).ratio()
+                if ratio >= 0.9:
+                    score += 0.9
+                    break
+                elif ratio >= 0.8:
+                    score += 0.6
+                    break
+        mood_scores[mood] = score
+
+    max_score = max(mood_scores.values()) if mood_scores else 0
+    if max_score <= 0:
+        return TextSentimentResult(mood=MoodType.NEUTRAL, confidence=55)
+
+    detected_mood = max(mood_scores, key=mood_scores.get)
+    total_words = max(1, len(words))
+    normalized = max_score / (total_words / 8)
+    confidence = int(min(97, max(60, normalized * 100)))
+    return TextSentimentResult(mood=MOOD_MAPPING[detected_mood], confidence=confidence)
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.9])
+def test_fuzzy_index_matches_difflib(threshold):
+    index = FuzzyKeywordIndex(KEYWORDS, threshold=threshold)
+    words = TYPO_WORDS + [word for text in _generated_corpus() for word in text.split()]
+    for word in words:
+        assert index.matches(word) == _baseline_matches(word, threshold), word
+
+
+def test_fuzzy_index_finds_typos():
+    index = FuzzyKeywordIndex(KEYWORDS, threshold=0.8)
+    assert "happy" in index.matches("happpy")
+    assert "stressed" in index.matches("stresed")
+    assert index.matches("xxxxxxxxxxxxxxxxxxxxxxxx") == {}
+
+
+def test_sentiment_matches_difflib_scoring():
+    for text in TYPO_TEXTS + _generated_corpus():
+        result = analyze_text_sentiment(text)
+        expected = _baseline_sentiment(text)
+        assert (result.mood, result.confidence) == (expected.mood, expected.confidence), text
+
+
+def test_batch_matches_single_text():
+    # Substring hits across word boundaries, a NUL inside a text, repeated keywords
+    texts = TYPO_TEXTS + _generated_corpus() + ["crusade", "nothing special!!", "sad\0sad", "calm calm calm"]
+    assert analyze_text_sentiment_batch(texts) == [analyze_text_sentiment(text) for text in texts]
+    assert analyze_text_sentiment_batch(texts[:1]) == [analyze_text_sentiment(texts[0])]
+    assert analyze_text_sentiment_batch([]) == []
@@ -0,0 +1,134 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import storage
+from models import MoodEntryCreate, MoodType
+from storage import NEGATIVE_STREAK_WINDOW, RECENT_MOOD_WINDOW, MemStorage
+
+USERS = ["u1", "u2", "u3"]
+MOODS = list(MoodType)
+LIMITS = [-1, 0, 1, 3, RECENT_MOOD_WINDOW - 1, RECENT_MOOD_WINDOW, RECENT_MOOD_WINDOW + 1, 25, 200]
+THRESHOLDS = [0, 50, 79, 80, 81, 95, 100]
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+class FakeClock:
+    """Stands in for ``storage.datetime`` so entry timestamps and expiry are controlled."""
+
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def now(self) -> datetime:
+        return self.current
+
+    def advance(self, delta: timedelta) -> None:
+        self.current += delta
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(START)
+    monkeypatch.setattr(storage, "datetime", fake)
+    return fake
+
+
+def _baseline_history(store: MemStorage, user_id: str, limit: int):
+    entries = [entry for entry in store.mood_entries.values() if entry.userId == user_id]
+    entries.sort(key=lambda x: x.timestamp, reverse=True)
+    return entries[:limit]
+
+
+def _baseline_count_recent(store: MemStorage, user_id: str, limit: int) -> int:
+    return sum(1 for entry in _baseline_history(store, user_id, limit) if entry.mood in {MoodType.STRESSED})
+
+
+def _baseline_count_since(store: MemStorage, user_id: str, since: datetime, min_confidence: int) -> int:
+    return sum(
+        1
+        for entry in store.mood_entries.values()
+        if entry.userId == user_id
+        and entry.timestamp >= since
+        and entry.mood == MoodType.STRESSED
+        and entry.confidence >= min_confidence
+    )
+
+
+def _add(store: MemStorage, user_id: str, mood: MoodType, confidence: int):
+    return asyncio.run(store.create_mood_entry(MoodEntryCreate(userId=user_id, mood=mood, confidence=confidence)))
+
+
+def _check(store: MemStorage, clock: FakeClock, user_id: str, rng: random.Random) -> None:
+    for limit in LIMITS:
+        assert asyncio.run(store.count_recent_negative_moods(user_id, limit)) == _baseline_count_recent(
+            store, user_id, limit
+        ), limit
+    for min_confidence in THRESHOLDS:
+        # Inside the 3-day window, right at its edge, and well beyond it
+        for since in (
+            clock.now() - timedelta(hours=rng.uniform(0, 24)),
+            clock.now() - NEGATIVE_STREAK_WINDOW,
+            clock.now() - timedelta(days=rng.uniform(3, 10)),
+        ):
+            assert asyncio.run(store.count_negative_moods_since(user_id, since, min_confidence)) == (
+                _baseline_count_since(store, user_id, since, min_confidence)
+            ), (since, min_confidence)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_counters_match_scan(clock, seed):
+    rng = random.Random(seed)
+    store = MemStorage()
+    for step in range(300):
+        # Mostly small steps, some ties and the odd multi-day gap so entries expire
+        clock.advance(rng.choice([timedelta(0), timedelta(minutes=rng.uniform(1, 600)), timedelta(days=rng.uniform(1, 4))]))
+        mood = MoodType.STRESSED if rng.random() < 0.4 else rng.choice(MOODS)
+        _add(store, rng.choice(USERS), mood, rng.randint(0, 100))
+        if step % 7 == 0:
+            _check(store, clock, rng.choice(USERS), rng)
+    for user_id in USERS + ["nobody"]:
+        _check(store, clock, user_id, rng)
+
+
+def test_expired_entries_are_not_counted(clock):
+    store = MemStorage()
+    for _ in range(4):
+        _add(store, "u1", MoodType.STRESSED, 90)
+        clock.advance(timedelta(hours=1))
+    assert asyncio.run(store.count_negative_moods_since("u1", clock.now() - NEGATIVE_STREAK_WINDOW)) == 4
+
+    clock.advance(NEGATIVE_STREAK_WINDOW)
+    _add(store, "u1", MoodType.STRESSED, 85)
+    window_start = clock.now() - NEGATIVE_STREAK_WINDOW
+    assert asyncio.run(store.count_negative_moods_since("u1", window_start)) == 1
+    assert _baseline_count_since(store, "u1", window_start, 80) == 1
+
+    # Older than the counter's horizon: answered from the entries themselves
+    since = START - timedelta(days=1)
+    assert asyncio.run(store.count_negative_moods_since("u1", since)) == 5
+    assert asyncio.run(store.count_negative_moods_since("u1", since, 86)) == 4
+
+
+def test_recent_count_beyond_window(clock):
+    store = MemStorage()
+    for i in range(RECENT_MOOD_WINDOW * 3):
+        clock.advance(timedelta(minutes=5))
+        _add(store, "u1", MoodType.STRESSED if i < RECENT_MOOD_WINDOW else MoodType.CALM, 90)
+    assert asyncio.run(store.count_recent_negative_moods("u1")) == 0
+    assert asyncio.run(store.count_recent_negative_moods("u1", RECENT_MOOD_WINDOW * 3)) == RECENT_MOOD_WINDOW
+    assert asyncio.run(store.count_recent_negative_moods("u1", RECENT_MOOD_WINDOW * 2 + 1)) == 1
+
+
+def test_history_matches_scan(clock):
+    rng = random.Random(7)
+    store = MemStorage()
+    for _ in range(200):
+        clock.advance(rng.choice([timedelta(0), timedelta(seconds=rng.uniform(1, 3600))]))
+        _add(store, rng.choice(USERS), rng.choice(MOODS), rng.randint(0, 100))
+    for user_id in USERS:
+        for limit in LIMITS:
+            assert asyncio.run(store.get_mood_history(user_id, limit)) == _baseline_history(store, user_id, limit)
+        baseline = _baseline_history(store, user_id, 1)
+        assert asyncio.run(store.get_latest_mood(user_id)) == (baseline[0] if baseline else None)